@@ -0,0 +1,138 @@
+"""
+Microbenchmarks for the marshaling and perception hot paths, run on synthetic inputs so no simulator is needed.
+
+Run them from the repository root:
+
+    python -m benchmarks                      # run everything and compare with benchmarks/baseline.json
+    python -m benchmarks -k perception        # only the cases whose name contains "perception"
+    python -m benchmarks --save               # store the results as the new baseline
+
+Results are the best time per call in seconds out of several repeats, keyed by case name.
+"""
+import json
+import os
+import platform
+import sys
+import timeit
+from datetime import datetime
+
+import numpy as np
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+SUITES = {}
+
+
+def suite(function):
+    """
+    Registers a suite. A suite is a generator yielding (case name, callable) pairs; it may raise ImportError
+    before its first case when an optional dependency is missing, and is then skipped.
+    """
+    SUITES[function.__name__] = function
+    return function
+
+
+def time_call(function, min_time=0.05, repeat=5):
+    """
+    Args:
+        function (callable): Called without arguments.
+        min_time (float): Each repeat calls the function often enough to take at least this many seconds.
+        repeat (int): The number of repeats.
+
+    Returns:
+        float: The best time per call in seconds.
+    """
+    timer = timeit.Timer(function)
+    number, elapsed = 1, 0.0
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / elapsed * 1.2)) if elapsed > 0 else number * 10
+    return min([elapsed] + timer.repeat(repeat - 1, number)) / number
+
+
+def run(pattern=None, min_time=0.05, repeat=5, log=print):
+    """
+    Runs the cases of all suites whose name contains pattern.
+
+    Returns:
+        dict: Maps case names to the best time per call in seconds.
+    """
+    # importing the suites registers them
+    from benchmarks import suites
+
+    results = {}
+    for suite_name, cases in SUITES.items():
+        try:
+            for case, function in cases():
+                name = f"{suite_name}.{case}"
+                if pattern and pattern not in name:
+                    continue
+                results[name] = time_call(function, min_time, repeat)
+                log(f"{name:<60} {format_time(results[name]):>10}")
+        except ImportError as e:
+            log(f"{suite_name:<60} skipped, {e}")
+    return results
+
+
+def format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def save(results, path=BASELINE):
+    """Writes results to path together with the versions and the machine they were measured with."""
+    data = {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+        },
+        'results': results,
+    }
+    with open(path, 'w') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+
+
+def load(path=BASELINE):
+    """
+    Returns:
+        dict: The results stored in path, or an empty dict if there is no such file.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def compare(results, baseline, threshold=0.1, log=print):
+    """
+    Prints every case next to its baseline time.
+
+    Args:
+        results (dict): The current results.
+        baseline (dict): The results to compare with.
+        threshold (float): Relative changes larger than this are marked as slower or faster.
+
+    Returns:
+        list: The names of the cases that got slower by more than threshold.
+    """
+    slower = []
+    for name, seconds in results.items():
+        if name not in baseline:
+            log(f"{name:<60} {format_time(seconds):>10}   new")
+            continue
+        ratio = seconds / baseline[name]
+        mark = ''
+        if ratio > 1 + threshold:
+            mark = 'slower'
+            slower.append(name)
+        elif ratio < 1 - threshold:
+            mark = 'faster'
+        log(f"{name:<60} {format_time(seconds):>10} {format_time(baseline[name]):>10} {ratio:6.2f}x {mark}")
+    return slower
@@ -0,0 +1,27 @@
+import argparse
+import sys
+
+from benchmarks import BASELINE, compare, load, run, save
+
+parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Times the hot paths on synthetic inputs.')
+parser.add_argument('-k', dest='pattern', help='only run the cases whose name contains this')
+parser.add_argument('--baseline', default=BASELINE, help='the baseline JSON file (default: %(default)s)')
+parser.add_argument('--save', action='store_true', help='store the results as the new baseline')
+parser.add_argument('--min-time', type=float, default=0.05, help='seconds per repeat (default: %(default)s)')
+parser.add_argument('--repeat', type=int, default=5, help='repeats per case (default: %(default)s)')
+parser.add_argument('--threshold', type=float, default=0.1,
+                    help='relative change reported as slower or faster (default: %(default)s)')
+args = parser.parse_args()
+
+results = run(args.pattern, args.min_time, args.repeat)
+if args.save:
+    # keep the baseline of the cases that were not run this time
+    save({**load(args.baseline), **results}, args.baseline)
+    print(f"saved {len(results)} results to {args.baseline}")
+else:
+    baseline = load(args.baseline)
+    if baseline:
+        print()
+        slower = compare(results, baseline, args.threshold)
+        print(f"\n{len(slower)} of {len(results)} cases slower than the baseline by more than {args.threshold:.0%}")
+        sys.exit(1 if slower else 0)
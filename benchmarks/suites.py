@@ -0,0 +1,157 @@
+import ctypes as ct
+from contextlib import contextmanager
+
+import numpy as np
+
+from benchmarks import suite
+
+RESOLUTIONS = (16, 32, 64, 128, 256)
+SIZES = (16, 256, 4096, 65536)
+
+_rng = np.random.default_rng(0)
+
+
+def random_image(res):
+    """A res*res RGB uint8 image with a dark band down the middle, so the predicates find something."""
+    image = _rng.integers(0, 256, (res, res, 3), dtype=np.uint8)
+    image[:, res // 3: 2 * res // 3] //= 8
+    return image
+
+
+@contextmanager
+def synthetic(prototype, function):
+    """
+    Binds a sim.py prototype to a Python function instead of the remote API library, so the getters
+    marshal synthetic C buffers without a connection.
+    """
+    previous = prototype.function
+    prototype.function = ct.CFUNCTYPE(prototype.restype, *prototype.argtypes)(function)
+    try:
+        yield
+    finally:
+        prototype.function = previous
+
+
+@suite
+def marshaling():
+    import sim
+
+    for size in SIZES:
+        floats = _rng.random(size).astype(np.float32)
+        values = floats.tolist()
+        packed = sim.simxPackFloats(values)
+        ints = list(range(size))
+        packed_ints = sim.simxPackInts(ints)
+        yield f"pack_floats[{size}]", lambda values=values: sim.simxPackFloats(values)
+        yield f"pack_floats_array[{size}]", lambda floats=floats: sim.simxPackFloats(floats)
+        yield f"unpack_floats[{size}]", lambda packed=packed: sim.simxUnpackFloats(packed)
+        yield f"unpack_floats_array[{size}]", lambda packed=packed: sim.simxUnpackFloats(packed, asArray=True)
+        yield f"pack_ints[{size}]", lambda ints=ints: sim.simxPackInts(ints)
+        yield f"unpack_ints[{size}]", lambda packed=packed_ints: sim.simxUnpackInts(packed)
+        yield f"unpack_ints_array[{size}]", lambda packed=packed_ints: sim.simxUnpackInts(packed, asArray=True)
+
+
+@suite
+def getters():
+    import sim
+
+    for res in RESOLUTIONS:
+        buffer = (ct.c_byte * (res * res * 3)).from_buffer_copy(random_image(res).tobytes())
+
+        def get_image(clientID, handle, resolution, image, options, mode, res=res, buffer=buffer):
+            resolution[0] = resolution[1] = res
+            image[0] = ct.cast(buffer, ct.POINTER(ct.c_byte))
+            return 0
+
+        # the generator is suspended inside the with block while its cases are timed
+        with synthetic(sim.c_GetVisionSensorImage, get_image):
+            yield f"vision_sensor_image[{res}].list", \
+                lambda: sim.simxGetVisionSensorImage(0, 0, 0, sim.simx_opmode_buffer)
+            yield f"vision_sensor_image[{res}].array", \
+                lambda: sim.simxGetVisionSensorImage(0, 0, 0, sim.simx_opmode_buffer, asArray=True)
+
+    for size in SIZES:
+        signal = (ct.c_ubyte * size).from_buffer_copy(_rng.bytes(size))
+
+        def get_signal(clientID, name, value, length, mode, size=size, signal=signal):
+            value[0] = ct.cast(signal, ct.POINTER(ct.c_ubyte))
+            length[0] = size
+            return 0
+
+        out = bytearray(size)
+        with synthetic(sim.c_GetStringSignal, get_signal):
+            yield f"string_signal[{size}].bytearray", \
+                lambda: sim.simxGetStringSignal(0, 'signal', sim.simx_opmode_buffer)
+            yield f"string_signal[{size}].bytes", \
+                lambda: sim.simxGetStringSignal(0, 'signal', sim.simx_opmode_buffer, asBytes=True)
+            yield f"string_signal[{size}].out", \
+                lambda out=out: sim.simxGetStringSignal(0, 'signal', sim.simx_opmode_buffer, out=out)
+
+    for count in (10, 100, 1000):
+        handles = (ct.c_int32 * count)(*range(count))
+        floats = (ct.c_float * (count * 3))(*_rng.random(count * 3))
+        names = b''.join(b'object%d\0' % i for i in range(count))
+        strings = ct.create_string_buffer(names, len(names))
+
+        def get_group(clientID, object_type, data_type, handles_c, handles_p, ints_c, ints_p, floats_c, floats_p,
+                      strings_c, strings_p, mode, count=count, handles=handles, floats=floats, strings=strings):
+            handles_c[0], handles_p[0] = count, ct.cast(handles, ct.POINTER(ct.c_int32))
+            ints_c[0] = 0
+            floats_c[0], floats_p[0] = count * 3, ct.cast(floats, ct.POINTER(ct.c_float))
+            strings_c[0], strings_p[0] = count, ct.cast(strings, ct.POINTER(ct.c_char))
+            return 0
+
+        with synthetic(sim.c_GetObjectGroupData, get_group):
+            yield f"object_group_data[{count}].list", \
+                lambda: sim.simxGetObjectGroupData(0, 0, 3, sim.simx_opmode_blocking)
+            yield f"object_group_data[{count}].array", \
+                lambda: sim.simxGetObjectGroupData(0, 0, 3, sim.simx_opmode_blocking, asArray=True)
+
+
+@suite
+def perception():
+    import sim
+    from mindstorms import ImageStatistics, image_correction
+
+    for res in RESOLUTIONS:
+        image = random_image(res)
+        # the "Sensors" signal of the line follower scenes: floats between 0 and 1, bottom row first
+        packed = sim.simxPackFloats(image[::-1].ravel() / np.float32(255))
+        floats = sim.simxUnpackFloats(packed, asArray=True)
+        out = np.empty((res, res, 3), np.uint8)
+        sensor = ImageStatistics()
+
+        def fresh(image=image, sensor=sensor):
+            # every assignment is a new frame, so the per-frame cache does not hide the work
+            sensor.image = image
+            return sensor
+
+        yield f"image_correction[{res}]", lambda floats=floats, res=res: image_correction(floats, res)
+        yield f"image_correction_out[{res}]", lambda floats=floats, res=res, out=out: image_correction(floats, res, out)
+        yield f"reflection[{res}]", lambda fresh=fresh: fresh().reflection()
+        yield f"rgb[{res}]", lambda fresh=fresh: fresh().rgb()
+
+
+@suite
+def line_maze():
+    # lineMaze needs cv2 and matplotlib
+    import lineMaze
+
+    for res in RESOLUTIONS:
+        yield f"process_image[{res}]", lambda image=random_image(res): lineMaze.process_image(image)
+
+
+@suite
+def object_sorter():
+    # object_sorter needs the ZMQ remote API client and cv2; its devices run on the kinematic simulator
+    from devices import object_sorting_scene, load_object_sorter
+
+    scene = object_sorting_scene(np.zeros((100, 100, 3), np.uint8), sonar=0.1)
+    module = load_object_sorter(scene)
+    predicates = ['facing_wall', 'seeing_brown_block', 'seeing_black_block', 'seeing_green_block',
+                  'having_brown_block', 'having_black_block', 'having_green_block', 'close_to_wall',
+                  'seeing_red_plant', 'seeing_blue_plant']
+    for res in RESOLUTIONS:
+        image = random_image(res)
+        for predicate in predicates:
+            yield f"{predicate}[{res}]", lambda predicate=getattr(module, predicate), image=image: predicate(image)
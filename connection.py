@@ -0,0 +1,517 @@
+import multiprocessing
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+import sim as sim
+
+
+# STREAMING
+
+class Subscription:
+    """
+    A remote API read that is registered once on the server with simx_opmode_streaming and
+    afterwards served from the local input buffer with simx_opmode_buffer, so reads never wait
+    on the network.
+
+    Attributes:
+        clientID (int): The client ID returned by sim.simxStart.
+        value: The last value read successfully, or None if nothing has arrived yet.
+        received_at (float): time.monotonic() of the last fresh reply, or None.
+    """
+
+    def __init__(self, clientID):
+        self.clientID = clientID
+        self.value = None
+        self.received_at = None
+        self.subscribed = False
+        self._server_time = None
+
+    def _call(self, operationMode):
+        """
+        Issues the underlying simx call with the given operation mode.
+
+        Returns:
+            (return_code, value) as returned by the simx call.
+        """
+        raise NotImplementedError
+
+    def subscribe(self):
+        """Registers the read on the server, if not done already."""
+        if not self.subscribed:
+            self._call(sim.simx_opmode_streaming)
+            self.subscribed = True
+
+    def read(self):
+        """
+        Reads the latest value from the local input buffer.
+
+        Returns:
+            (return_code, value): return_code is sim.simx_return_ok once a reply has arrived,
+            value is the latest value received (None before the first reply).
+        """
+        self.subscribe()
+        return_code, value = self._call(sim.simx_opmode_buffer)
+        if return_code == sim.simx_return_ok:
+            self.value = value
+            # every message of the server carries the replies of all streamed commands, so a new
+            # server timestamp means a new reply for this one as well
+            info_code, server_time = sim.simxGetInMessageInfo(self.clientID, sim.simx_headeroffset_server_time)
+            if info_code == -1 or server_time != self._server_time:
+                self._server_time = server_time
+                self.received_at = time.monotonic()
+        return return_code, self.value
+
+    def wait(self, timeout=1.0, poll_interval=0.001):
+        """
+        Blocks until the first reply has arrived.
+
+        Args:
+            timeout (float): Maximum time to wait in seconds.
+            poll_interval (float): Time to sleep between two buffer reads in seconds.
+
+        Returns:
+            (return_code, value) of the last read.
+        """
+        deadline = time.monotonic() + timeout
+        return_code, value = self.read()
+        while return_code != sim.simx_return_ok and time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            return_code, value = self.read()
+        return return_code, value
+
+    def age(self):
+        """
+        Returns:
+            The time in seconds since the last fresh reply, or infinity if none has arrived.
+        """
+        if self.received_at is None:
+            return float('inf')
+        return time.monotonic() - self.received_at
+
+    def unsubscribe(self):
+        """Stops the streaming on the server side."""
+        if self.subscribed:
+            self._call(sim.simx_opmode_discontinue)
+            self.subscribed = False
+
+    def __enter__(self):
+        self.subscribe()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.unsubscribe()
+
+
+class StringSignalSubscription(Subscription):
+    """Streams a string signal, e.g. the "Sensors" signal carrying the camera frame."""
+
+    def __init__(self, clientID, signal_name):
+        super().__init__(clientID)
+        self.signal_name = signal_name
+
+    def _call(self, operationMode):
+        return sim.simxGetStringSignal(self.clientID, self.signal_name, operationMode, asBytes=True)
+
+
+class VisionSensorSubscription(Subscription):
+    """Streams the image of a vision sensor as a uint8 array of shape (resY, resX, 3)."""
+
+    def __init__(self, clientID, sensor_handle, options=0):
+        super().__init__(clientID)
+        self.sensor_handle = sensor_handle
+        self.options = options
+
+    def _call(self, operationMode):
+        return_code, resolution, image = sim.simxGetVisionSensorImage(self.clientID, self.sensor_handle, self.options,
+                                                                      operationMode, asArray=True)
+        return return_code, image
+
+
+# SYNCHRONOUS MODE
+
+class SynchronousRunner:
+    """
+    Runs a controller in lockstep with the simulator: every control tick is followed by exactly one
+    simulation step. The simulator waits for the controller instead of running in real time, which
+    makes runs deterministic and lets the simulation go faster than real time when the controller
+    keeps up.
+
+    Synchronous mode has to be enabled before the simulation starts, so by default the runner starts
+    the simulation itself and stops it again when it is closed.
+
+    Attributes:
+        clientID (int): The client ID returned by sim.simxStart.
+        steps (int): The number of simulation steps triggered so far.
+    """
+
+    def __init__(self, clientID, start_simulation=True):
+        self.clientID = clientID
+        self.start_simulation = start_simulation
+        self.steps = 0
+        self._started_at = None
+
+    def _check(self, return_code, command):
+        if return_code != sim.simx_return_ok:
+            raise ConnectionError(f'{command} failed for client {self.clientID} with return code {return_code}')
+
+    def open(self):
+        """
+        Enables synchronous mode and, if requested, starts the simulation.
+
+        Raises:
+            ConnectionError: If the server did not accept one of the commands.
+        """
+        self._check(sim.simxSynchronous(self.clientID, True), 'simxSynchronous')
+        if self.start_simulation:
+            self._check(sim.simxStartSimulation(self.clientID, sim.simx_opmode_blocking), 'simxStartSimulation')
+        self.steps = 0
+        self._started_at = time.monotonic()
+
+    def close(self):
+        """Stops the simulation if the runner started it and disables synchronous mode."""
+        if self.start_simulation:
+            sim.simxStopSimulation(self.clientID, sim.simx_opmode_blocking)
+        sim.simxSynchronous(self.clientID, False)
+
+    def step(self):
+        """
+        Triggers one simulation step and blocks until it is done. The ping round trip only
+        returns once the server has processed the trigger and finished the step.
+
+        Raises:
+            ConnectionError: If the trigger or the ping failed, e.g. because the connection was lost.
+        """
+        self._check(sim.simxSynchronousTrigger(self.clientID), 'simxSynchronousTrigger')
+        self._check(sim.simxGetPingTime(self.clientID)[0], 'simxGetPingTime')
+        self.steps += 1
+
+    def run(self, tick, steps=None):
+        """
+        Calls tick(t) and then advances the simulation by one step, until tick returns False or
+        the given number of steps is reached.
+
+        Args:
+            tick (callable): The control tick, called with the current step index.
+            steps (int): The number of steps to run, or None to run until tick returns False.
+
+        Returns:
+            The number of simulation steps per wall-clock second.
+        """
+        while steps is None or self.steps < steps:
+            if tick(self.steps) is False:
+                break
+            self.step()
+        return self.steps_per_second()
+
+    def steps_per_second(self):
+        """
+        Returns:
+            The number of simulation steps per wall-clock second since the runner was opened.
+        """
+        if self._started_at is None:
+            return 0.0
+        elapsed = time.monotonic() - self._started_at
+        return self.steps / elapsed if elapsed > 0 else 0.0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# COMMAND BATCHING
+
+# the number of open batches per client, over all threads; the communication is paused while it is not 0
+_open_batches = {}
+# the batches opened by the current thread, per client
+_thread_batches = threading.local()
+_batches_lock = threading.Lock()
+
+
+def _own_batches():
+    if not hasattr(_thread_batches, 'depth'):
+        _thread_batches.depth = {}
+    return _thread_batches.depth
+
+
+@contextmanager
+def batch(clientID):
+    """
+    Pauses the communication thread so that all commands issued inside the block are sent to the
+    server together in one packet when the block exits. Batches can be nested and opened by several
+    threads; only the first one pauses and the last one resumes the communication.
+
+    Blocking commands would wait forever for a reply that is never sent while the communication is
+    paused, so writes pick their operation mode with operation_mode(), which returns
+    simx_opmode_oneshot inside a batch of the calling thread. Reads cannot be batched: a oneshot read
+    returns the previous reply, so sensors keep their blocking or buffer reads and raise a
+    RuntimeError from check_not_in_batch() for a blocking read inside a batch, which would otherwise
+    stall until the connection timeout. Other threads are not affected; their blocking calls wait for
+    the batch to be sent.
+
+    Args:
+        clientID (int): The client ID returned by sim.simxStart.
+    """
+    own = _own_batches()
+    with _batches_lock:
+        depth = _open_batches.get(clientID, 0)
+        if depth == 0:
+            sim.simxPauseCommunication(clientID, 1)
+        _open_batches[clientID] = depth + 1
+    own[clientID] = own.get(clientID, 0) + 1
+    try:
+        yield
+    finally:
+        own[clientID] -= 1
+        if own[clientID] == 0:
+            del own[clientID]
+        with _batches_lock:
+            _open_batches[clientID] -= 1
+            if _open_batches[clientID] == 0:
+                del _open_batches[clientID]
+                sim.simxPauseCommunication(clientID, 0)
+
+
+def in_batch(clientID):
+    """
+    Returns:
+        True if the current thread has a batch open for the given client.
+    """
+    return clientID in _own_batches()
+
+
+def check_not_in_batch(clientID, what):
+    """
+    Guards a blocking read, whose reply cannot arrive while the current thread holds the communication paused.
+
+    Args:
+        clientID (int): The client ID returned by sim.simxStart.
+        what (str): The read, for the error message.
+
+    Raises:
+        RuntimeError: If the current thread has a batch open for the client.
+    """
+    if in_batch(clientID):
+        raise RuntimeError(f'{what} is a blocking read and cannot be issued inside a batch; read it before the batch')
+
+
+def operation_mode(clientID, default=sim.simx_opmode_blocking):
+    """
+    Picks the operation mode of a write.
+
+    Returns:
+        simx_opmode_oneshot inside a batch opened by the current thread, the given default otherwise.
+    """
+    if in_batch(clientID):
+        return sim.simx_opmode_oneshot
+    return default
+
+
+# CLIENT POOL
+
+def connect(port, host='127.0.0.1', timeout_ms=5000):
+    """
+    Connects to a remote API server.
+
+    Args:
+        port (int): The port of the remote API server.
+        host (str): The address of the remote API server.
+        timeout_ms (int): Connection timeout in milliseconds.
+
+    Returns:
+        The client ID.
+
+    Raises:
+        ConnectionError: If no connection could be established.
+    """
+    clientID = sim.simxStart(host, port, True, True, timeout_ms, 5)
+    if clientID == -1:
+        raise ConnectionError(f'Failed connecting to remote API server at {host}:{port}')
+    return clientID
+
+
+def is_healthy(clientID):
+    """
+    Returns:
+        True if the client is still connected to its server.
+    """
+    return clientID != -1 and sim.simxGetConnectionId(clientID) != -1
+
+
+class ClientPool:
+    """
+    A pool of CoppeliaSim instances listening on different ports, so that several controllers can be
+    evaluated at once.
+
+    The pool either attaches to servers that are already running or, given the path of the CoppeliaSim
+    executable and a scene, launches one headless instance per port. Client IDs only exist in the
+    process that called simxStart, so worker processes get a port from the pool and connect themselves:
+
+        pool = ClientPool(ports=[19997, 19998, 19999], executable=..., scene='scenes/lineMazeNew.ttt')
+        with pool:
+            with ProcessPoolExecutor(len(pool), initializer=init_worker, initargs=(pool.port_queue(),)) as executor:
+                ...  # in the worker, worker_client() returns a healthy client ID
+
+    Within a single process, acquire() and release() hand out client IDs directly.
+
+    Attributes:
+        ports (list): The ports of the servers in the pool.
+        host (str): The address of the servers.
+    """
+
+    def __init__(self, ports, host='127.0.0.1', executable=None, scene=None, launch_timeout=30.0):
+        self.ports = list(ports)
+        self.host = host
+        self.executable = executable
+        self.scene = scene
+        self.launch_timeout = launch_timeout
+        self._processes = []
+        self._free_ports = list(self.ports)
+        self._clients = {}
+
+    def __len__(self):
+        return len(self.ports)
+
+    def start(self, poll_interval=0.1):
+        """
+        Launches one headless instance per port, if an executable was given, and waits until all accept connections.
+
+        Args:
+            poll_interval (float): Time to sleep between two connection attempts in seconds.
+        """
+        if self.executable is not None:
+            for port in self.ports:
+                # -h runs headless, -g passes the continuous remote API server service on this port
+                args = [self.executable, '-h', f'-gREMOTEAPISERVERSERVICE_{port}_FALSE_TRUE']
+                if self.scene is not None:
+                    args.append(self.scene)
+                self._processes.append(subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+        deadline = time.monotonic() + self.launch_timeout
+        for port in self.ports:
+            while True:
+                clientID = sim.simxStart(self.host, port, True, True, 1000, 5)
+                if clientID != -1:
+                    sim.simxFinish(clientID)
+                    break
+                if time.monotonic() > deadline:
+                    self.close()
+                    raise ConnectionError(f'Simulator at {self.host}:{port} did not come up within {self.launch_timeout} s')
+                # the instance is still booting, give it some time instead of hammering the port
+                time.sleep(poll_interval)
+
+    def close(self):
+        """Disconnects all clients of this process and terminates the launched instances."""
+        for clientID in list(self._clients):
+            sim.simxFinish(clientID)
+        self._clients.clear()
+        self._free_ports = list(self.ports)
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            process.wait()
+        self._processes = []
+
+    def acquire(self):
+        """
+        Connects to a free server of the pool.
+
+        Returns:
+            The client ID.
+
+        Raises:
+            RuntimeError: If all servers are in use.
+        """
+        if not self._free_ports:
+            raise RuntimeError('All simulators of the pool are in use')
+        port = self._free_ports.pop()
+        try:
+            clientID = connect(port, self.host)
+        except ConnectionError:
+            self._free_ports.append(port)
+            raise
+        self._clients[clientID] = port
+        return clientID
+
+    def release(self, clientID):
+        """Disconnects the client and returns its server to the pool."""
+        port = self._clients.pop(clientID)
+        sim.simxFinish(clientID)
+        self._free_ports.append(port)
+
+    def recycle(self, clientID):
+        """
+        Replaces a client by a fresh connection to the same server.
+
+        Returns:
+            The new client ID.
+        """
+        port = self._clients.pop(clientID)
+        sim.simxFinish(clientID)
+        try:
+            clientID = connect(port, self.host)
+        except ConnectionError:
+            self._free_ports.append(port)
+            raise
+        self._clients[clientID] = port
+        return clientID
+
+    def port_queue(self):
+        """
+        Returns:
+            A multiprocessing queue holding every port of the pool once, to be passed to init_worker.
+        """
+        queue = multiprocessing.Queue()
+        for port in self.ports:
+            queue.put(port)
+        return queue
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+_worker_host = None
+_worker_port = None
+_worker_clientID = -1
+
+
+def init_worker(port_queue, host='127.0.0.1'):
+    """
+    Process pool initializer: takes one port of the pool for the lifetime of the worker process and connects to it.
+
+    Args:
+        port_queue: The queue returned by ClientPool.port_queue.
+        host (str): The address of the servers.
+    """
+    global _worker_host, _worker_port, _worker_clientID
+    _worker_host = host
+    _worker_port = port_queue.get()
+    _worker_clientID = connect(_worker_port, host)
+
+
+def worker_client():
+    """
+    Returns:
+        The client ID of this worker process, reconnecting first if the connection was lost.
+    """
+    global _worker_clientID
+    if _worker_port is None:
+        raise RuntimeError('worker_client() called in a process that was not initialized with init_worker')
+    if not is_healthy(_worker_clientID):
+        sim.simxFinish(_worker_clientID)
+        _worker_clientID = connect(_worker_port, _worker_host)
+    return _worker_clientID
+
+
+def worker_port():
+    """
+    Returns:
+        The port of the simulator assigned to this worker process, or None outside a pool worker.
+    """
+    return _worker_port
@@ -0,0 +1,18 @@
+"""
+Devices that run on pluggable transports, so the same controller talks to the legacy remote API, the ZMQ
+remote API, an in-process stand-in or the kinematic simulator in devices.kinematic. Import it from the
+repository root, next to sim.py and mindstorms.py:
+
+    from devices import make_transport, DriveBase, ColorSensor
+
+    transport = make_transport('legacy', clientID)
+    drive_base = DriveBase(transport)
+    color_sensor = ColorSensor(transport)
+"""
+from devices.transports import (Transport, LegacyTransport, ZmqTransport, InProcessTransport, TRANSPORTS,
+                                make_transport, device_name)
+from devices.components import (DeviceNames, Component, Motor, DriveBase, ImageSensor, ColorSensor, Robot,
+                                Robot_OS)
+from devices.kinematic import (Camera, KinematicTransport, line_track, line_follower_scene, object_sorting_scene,
+                               load_object_sorter)
+from mindstorms import Direction, Color
@@ -0,0 +1,264 @@
+import struct
+import time
+from enum import Enum
+from mindstorms import Direction, ImageStatistics
+from devices.transports import device_name
+
+
+class DeviceNames(Enum):
+    """
+    Enum representing different devices for the coppeliasim tasks.
+
+    Attributes:
+       MOTOR_LEFT_LINE: The left motor as seen from the back of the robot of the linefollower task.
+       MOTOR_RIGHT_LINE: The right motor as seen from the back of the robot of the linefollower task.
+       IMAGE_SENSOR_LINE: The camera of the linefollower task.
+       TOP_IMAGE_SENSOR_OS: Top camera for the object sorting task
+       SMALL_IMAGE_SENSOR_OS: Bottom small camera for the object sorting task
+       MOTOR_LEFT_OS: The left motor as seen from the back of the robot of the object sorting task.
+       MOTOR_RIGHT_OS: The right motor as seen from the back of the robot of the object sorting task.
+       ROBOT_OS: The robot of the object sorting task.
+       PORT_A: The left wheel of the line follower scenes driven through the "motors" signal.
+       PORT_B: The right wheel of the line follower scenes driven through the "motors" signal.
+       SENSOR_SIGNAL: The camera of the line follower scenes sent as the "Sensors" signal.
+    """
+    MOTOR_LEFT_LINE = "/LineTracer/DynamicLeftJoint"
+    MOTOR_RIGHT_LINE = "/LineTracer/DynamicRightJoint"
+    IMAGE_SENSOR_LINE = "/LineTracer/Vision_sensor"
+
+    TOP_IMAGE_SENSOR_OS = "/dr12/dr12_top_camera"
+    SMALL_IMAGE_SENSOR_OS = "/dr12/dr12_small_camera"
+    MOTOR_LEFT_OS = "/dr12/dr12_leftJoint_"
+    MOTOR_RIGHT_OS = "/dr12/dr12_rightJoint_"
+    ROBOT_OS = "/dr12"
+
+    PORT_A = "A"
+    PORT_B = "B"
+    SENSOR_SIGNAL = "Sensors"
+
+
+class Component:
+    """
+    A device of the scene, reached through a transport.
+
+    Attributes:
+        transport (devices.Transport): The connection to the simulator.
+        name (str): The name of the device in the scene.
+    """
+
+    def __init__(self, transport, name):
+        self.transport = transport
+        self.name = device_name(name)
+        self._handle = transport.get_handle(self.name)
+
+
+class Motor(Component):
+    def __init__(self, transport, name, direction=Direction.CLOCKWISE):
+        """
+        Simplified version of the pyBricks motor class, running on any transport.
+
+        Args:
+            transport (devices.Transport): The connection to the simulator.
+            name (str or DeviceNames): The motor, e.g. DeviceNames.PORT_A or DeviceNames.MOTOR_LEFT_OS.
+            direction (Direction): The direction of the motor rotation, either CLOCKWISE or COUNTERCLOCKWISE.
+        """
+        assert isinstance(direction, Direction), "Direction must be an instance of Direction enum"
+        super().__init__(transport, name)
+        self.direction = direction
+
+    def run(self, speed):
+        """
+        Sets the speed of the motor, with its direction applied.
+
+        Args:
+            speed (float): The desired speed for the motor.
+        """
+        self.transport.set_motor_speed(self._handle, speed * self.direction.value)
+
+
+class DriveBase:
+    """
+    Two motors driven together, so transports that support it send both speeds in one command. On the
+    LegacyTransport the speeds go through the mindstorms.DriveBase of the transport, which owns the
+    packed speed signal of the line follower scenes.
+
+    Attributes:
+        left (Motor): The left motor as seen from the back of the robot.
+        right (Motor): The right motor as seen from the back of the robot.
+    """
+
+    def __init__(self, transport, left=DeviceNames.PORT_A, right=DeviceNames.PORT_B,
+                 left_direction=Direction.CLOCKWISE, right_direction=Direction.CLOCKWISE):
+        """
+        Args:
+            transport (devices.Transport): The connection to the simulator.
+            left (str or DeviceNames): The left motor.
+            right (str or DeviceNames): The right motor.
+            left_direction (Direction): The direction of the left motor.
+            right_direction (Direction): The direction of the right motor.
+        """
+        self.transport = transport
+        self.left = Motor(transport, left, left_direction)
+        self.right = Motor(transport, right, right_direction)
+
+    def tank(self, left, right):
+        """
+        Sets the speed of both wheels.
+
+        Args:
+            left (float): The speed of the left wheel.
+            right (float): The speed of the right wheel.
+        """
+        self.transport.set_motor_speeds({
+            self.left._handle: left * self.left.direction.value,
+            self.right._handle: right * self.right.direction.value,
+        })
+
+    def drive(self, speed, turn_rate):
+        """
+        Drives forward while turning, like mindstorms.DriveBase.drive.
+
+        Args:
+            speed (float): The mean speed of both wheels.
+            turn_rate (float): Added to the left and subtracted from the right wheel; positive turns right.
+        """
+        self.tank(speed + turn_rate, speed - turn_rate)
+
+    def stop(self):
+        """Stops both wheels."""
+        self.tank(0, 0)
+
+    def batch(self):
+        """
+        Returns:
+            A context manager grouping the commands issued inside it, where the transport supports it.
+        """
+        return self.transport.batch()
+
+
+class ImageSensor(Component, ImageStatistics):
+    def __init__(self, transport, name, color_classifier=None):
+        """
+        Camera running on any transport, with the measurements of mindstorms.ColorSensor.
+
+        Args:
+            transport (devices.Transport): The connection to the simulator.
+            name (str or DeviceNames): The camera, e.g. DeviceNames.SENSOR_SIGNAL or DeviceNames.TOP_IMAGE_SENSOR_OS.
+            color_classifier (mindstorms.ColorClassifier): Used by color() and color_fractions().
+        """
+        super().__init__(transport, name)
+        self.color_classifier = color_classifier
+        self._update_image()
+
+    def _update_image(self):
+        """
+        Updates self.image, should be run once before getting image data in the main loop
+        """
+        image = self.transport.read_image(self._handle)
+        # the same frame again, e.g. a streamed one that was not replaced yet, keeps its cached statistics
+        if image is not getattr(self, '_image', None):
+            self.image = image
+
+    def update_image(self):
+        """
+        Reads a new image, or picks up the newest prefetched one after start_prefetch().
+
+        Returns:
+            float: The time.monotonic() at which the image was captured, as far as the transport can tell.
+        """
+        self._update_image()
+        return time.monotonic() - self.transport.frame_age(self._handle)
+
+    def start_prefetch(self, timeout=1.0):
+        """
+        Lets the transport read frames in the background, so update_image() does not wait for a round trip.
+        Only the camera of the LegacyTransport prefetches; other transports keep reading on demand.
+
+        Args:
+            timeout (float): Maximum time in seconds to wait for the first frame.
+        """
+        self.transport.start_prefetch(self._handle, timeout)
+
+    def stop_prefetch(self):
+        """Stops reading frames in the background."""
+        self.transport.stop_prefetch(self._handle)
+
+    def frame_age(self):
+        """
+        Returns:
+            The age in seconds of the newest frame, 0 when frames are read on demand.
+        """
+        return self.transport.frame_age(self._handle)
+
+    def get_image(self):
+        """
+        Returns:
+            np.array of shape (height, width, 3): the current image stored in self.image
+        """
+        return self.image
+
+
+class ColorSensor(ImageSensor):
+    def __init__(self, transport, name=DeviceNames.SENSOR_SIGNAL, color_classifier=None):
+        """
+        The downward camera of the line follower scenes.
+
+        Args:
+            transport (devices.Transport): The connection to the simulator.
+            name (str or DeviceNames): The camera, the "Sensors" signal by default.
+            color_classifier (mindstorms.ColorClassifier): Used by color() and color_fractions().
+        """
+        super().__init__(transport, name, color_classifier)
+
+
+class Robot(Component):
+    """Generic robot exchanging signals with its scene."""
+
+    def set_integer_signal(self, signal_name, signal_value):
+        self.transport.set_integer_signal(signal_name, signal_value)
+
+    def get_string_signal(self, signal_name):
+        return self.transport.get_string_signal(signal_name)
+
+
+class Robot_OS(Robot):
+    def __init__(self, transport, name=DeviceNames.ROBOT_OS):
+        """
+        Robot class for the wall_e object sorting task
+
+        Args:
+            transport (devices.Transport): The connection to the simulator.
+            name (str or DeviceNames): The robot, DeviceNames.ROBOT_OS by default.
+        """
+        super().__init__(transport, name)
+
+    def compress(self):
+        """
+        Compresses boxes for the object sorting task
+        """
+        self.set_integer_signal("compress", 1)
+
+    def get_battery(self):
+        """
+        Gets current battery value of the robot
+
+        Returns:
+            String: battery value
+        """
+        return str(self.get_string_signal("battery"))
+
+    def get_bumper_sensor(self):
+        """
+        Gets the bumper sensor reading of the robot
+
+        Returns:
+            tuple: the three bumper sensor readings
+        """
+        return struct.unpack('3f', self.get_string_signal("bumper_sensor"))
+
+    def get_sonar_sensor(self):
+        """
+        Returns:
+            float: distance to the object in front, or -1 if no data
+        """
+        return struct.unpack('f', self.get_string_signal("sonar_sensor"))[0]
@@ -0,0 +1,301 @@
+import importlib.util
+import os
+import struct
+import sys
+import time
+import numpy as np
+from devices.transports import InProcessTransport, TRANSPORTS
+from devices.components import DeviceNames
+
+
+class Camera:
+    """
+    A camera looking straight down at the floor, rendered by sampling the floor texture under it.
+
+    The top row of the image is the one furthest ahead of the robot and the first column the leftmost one,
+    as in the images of the other transports.
+
+    Attributes:
+        resolution (tuple): The width and height of the image in pixels.
+        size (tuple): The width and height of the floor patch seen by the camera in meters.
+        offset (float): How far the centre of the patch lies ahead of the wheel axle in meters.
+    """
+
+    def __init__(self, resolution=(32, 32), size=(0.04, 0.04), offset=0.05):
+        self.resolution = resolution
+        self.size = size
+        self.offset = offset
+        width, height = resolution
+        # centres of the pixels in robot coordinates, one entry per pixel in row-major order
+        forward = offset + (np.arange(height)[::-1] + 0.5 - height / 2) * (size[1] / height)
+        left = (width / 2 - 0.5 - np.arange(width)) * (size[0] / width)
+        forward, left = np.meshgrid(forward, left, indexing='ij')
+        self._forward = forward.ravel()
+        self._left = left.ravel()
+
+
+class KinematicTransport(InProcessTransport):
+    """
+    Headless stand-in for CoppeliaSim: a differential drive robot moving over a 2D floor texture.
+
+    The wheel speeds set through Motor.run or DriveBase are integrated every step, and cameras return the
+    patch of the texture below them, so line followers and other controllers run without a simulator and
+    much faster than real time. There are no collisions, no wheel slip and no motor dynamics.
+
+    The floor lies in the x/y plane with x to the right and y up, the origin in the bottom left corner of the
+    texture. A heading of 0 points along x and positive turn rates turn counterclockwise. Beyond the edges
+    of the texture the edge pixels repeat.
+
+    Attributes:
+        texture (np.array): The floor as a uint8 array of shape (height, width, 3).
+        meters_per_pixel (float): The size of one texture pixel.
+        cameras (dict): Maps camera names to Camera.
+        x, y, heading (float): The pose of the robot, the centre of the wheel axle in meters and radians.
+        distance (float): The distance driven so far in meters.
+        steps (int): The number of steps simulated so far.
+        dt (float): The simulated time of one step in seconds.
+    """
+
+    LEFT_MOTORS = (DeviceNames.PORT_A.value, DeviceNames.MOTOR_LEFT_LINE.value, DeviceNames.MOTOR_LEFT_OS.value)
+    RIGHT_MOTORS = (DeviceNames.PORT_B.value, DeviceNames.MOTOR_RIGHT_LINE.value, DeviceNames.MOTOR_RIGHT_OS.value)
+
+    def __init__(self, texture, meters_per_pixel=0.005, pose=(0.0, 0.0, 0.0), cameras=None,
+                 wheel_radius=0.03, axle_track=0.12, dt=0.05):
+        """
+        Args:
+            texture (np.array): The floor as a uint8 array of shape (height, width, 3).
+            meters_per_pixel (float): The size of one texture pixel.
+            pose (tuple): The start pose (x, y, heading) in meters and radians.
+            cameras (dict): Maps camera names to Camera; by default one Camera called "Sensors", the camera
+                of the line follower scenes.
+            wheel_radius (float): Motor speeds are wheel speeds in rad/s, this turns them into m/s.
+            axle_track (float): The distance between the wheels in meters.
+            dt (float): The simulated time of one step in seconds, 50 ms like CoppeliaSim.
+        """
+        super().__init__()
+        self.texture = np.ascontiguousarray(texture, dtype=np.uint8)
+        self.meters_per_pixel = meters_per_pixel
+        self.cameras = {DeviceNames.SENSOR_SIGNAL.value: Camera()} if cameras is None else dict(cameras)
+        self.wheel_radius = wheel_radius
+        self.axle_track = axle_track
+        self.dt = dt
+        self._pixels = self.texture.reshape(-1, 3)
+        self._start_pose = pose
+        self.reset()
+
+    def reset(self, pose=None):
+        """Puts the robot back to its start pose, or to the given one, and stops the motors."""
+        self.x, self.y, self.heading = self._start_pose if pose is None else pose
+        self.distance = 0.0
+        self.steps = 0
+        self.motor_speeds.clear()
+        self._rendered = {}
+        self._started_at = None
+
+    def _wheel_speed(self, names):
+        for name in names:
+            if name in self.motor_speeds:
+                return self.motor_speeds[name]
+        return 0.0
+
+    def step(self, dt=None):
+        """
+        Moves the robot according to the current wheel speeds.
+
+        Args:
+            dt (float): The simulated time to advance, self.dt by default.
+        """
+        dt = self.dt if dt is None else dt
+        speed_l = self._wheel_speed(self.LEFT_MOTORS) * self.wheel_radius
+        speed_r = self._wheel_speed(self.RIGHT_MOTORS) * self.wheel_radius
+        speed = (speed_l + speed_r) / 2
+        turn_rate = (speed_r - speed_l) / self.axle_track
+        # move along the mean heading of the step, exact enough for the small turns of one step
+        heading = self.heading + turn_rate * dt / 2
+        self.x += speed * dt * np.cos(heading)
+        self.y += speed * dt * np.sin(heading)
+        self.heading += turn_rate * dt
+        self.distance += abs(speed) * dt
+        self.steps += 1
+
+    def render(self, camera):
+        """
+        Returns:
+            The image the camera sees from the current pose, a uint8 array of shape (height, width, 3).
+        """
+        cos, sin = np.cos(self.heading), np.sin(self.heading)
+        scale = 1 / self.meters_per_pixel
+        cols = ((self.x + camera._forward * cos - camera._left * sin) * scale).astype(np.intp)
+        rows = ((self.y + camera._forward * sin + camera._left * cos) * scale).astype(np.intp)
+        height, width = self.texture.shape[:2]
+        np.clip(cols, 0, width - 1, out=cols)
+        # texture rows count down from the top
+        rows = np.clip(height - 1 - rows, 0, height - 1)
+        width_px, height_px = camera.resolution
+        return self._pixels[rows * width + cols].reshape(height_px, width_px, 3)
+
+    def read_image(self, handle):
+        camera = self.cameras.get(handle)
+        if camera is None:
+            return super().read_image(handle)
+        # cameras are rendered at most once per step, however often they are read
+        rendered = self._rendered.get(handle)
+        if rendered is None or rendered[0] != self.steps:
+            rendered = self._rendered[handle] = (self.steps, self.render(camera))
+        return rendered[1]
+
+    @property
+    def time(self):
+        """The simulated time in seconds."""
+        return self.steps * self.dt
+
+    def open(self):
+        self._started_at = time.monotonic()
+
+    def close(self):
+        self.motor_speeds.clear()
+
+    def run(self, tick, steps=None):
+        """
+        Calls tick(t) and then advances the simulation by one step, until tick returns False or the given
+        number of steps is reached, like connection.SynchronousRunner.run.
+
+        Returns:
+            The number of simulation steps per wall-clock second.
+        """
+        if self._started_at is None:
+            self.open()
+        while steps is None or self.steps < steps:
+            if tick(self.steps) is False:
+                break
+            self.step()
+        return self.steps_per_second()
+
+    def steps_per_second(self):
+        """
+        Returns:
+            The number of simulation steps per wall-clock second since the simulation was opened.
+        """
+        if self._started_at is None:
+            return 0.0
+        elapsed = time.monotonic() - self._started_at
+        return self.steps / elapsed if elapsed > 0 else 0.0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+TRANSPORTS['kinematic'] = KinematicTransport
+
+
+def line_track(width=600, height=400, line_width=8, margin=60):
+    """
+    Draws a black elliptic line on a white floor, a closed track for line followers.
+
+    Args:
+        width (int): The width of the texture in pixels.
+        height (int): The height of the texture in pixels.
+        line_width (int): The width of the line in pixels.
+        margin (int): The distance between the line and the edges of the texture in pixels.
+
+    Returns:
+        np.array: The texture, a uint8 array of shape (height, width, 3).
+    """
+    rows, cols = np.mgrid[0:height, 0:width]
+    a, b = width / 2 - margin, height / 2 - margin
+    # distance from the ellipse, approximated by the normalised radius times the mean semi-axis
+    radius = np.sqrt(((cols - width / 2) / a) ** 2 + ((rows - height / 2) / b) ** 2)
+    on_line = np.abs(radius - 1) * (a + b) / 2 < line_width / 2
+    texture = np.full((height, width, 3), 255, np.uint8)
+    texture[on_line] = 0
+    return texture
+
+
+def line_follower_scene(texture=None, meters_per_pixel=0.005, margin=60, **kwargs):
+    """
+    Creates a simulator for the line follower controllers: the robot starts on the right end of the
+    line_track ellipse, driving counterclockwise, with its camera over the line.
+
+    Args:
+        texture (np.array): The floor; line_track() by default. A custom texture needs a pose argument.
+        meters_per_pixel (float): The size of one texture pixel.
+        margin (int): The margin the line_track was drawn with.
+        **kwargs: Passed on to KinematicTransport.
+
+    Returns:
+        KinematicTransport
+    """
+    if texture is None:
+        texture = line_track(margin=margin)
+    if 'pose' not in kwargs:
+        height, width = texture.shape[:2]
+        kwargs['pose'] = ((width - margin) * meters_per_pixel, height / 2 * meters_per_pixel, np.pi / 2)
+    return KinematicTransport(texture, meters_per_pixel, **kwargs)
+
+
+def object_sorting_scene(texture, meters_per_pixel=0.005, pose=(0.0, 0.0, 0.0), battery=1.0, sonar=1.0, **kwargs):
+    """
+    Creates a simulator with the devices of the object sorting scene. Both of its cameras look at the floor
+    here, the top one further ahead, and the battery, sonar and bumper signals hold fixed values that can
+    be changed through string_signals.
+
+    Args:
+        texture (np.array): The floor.
+        meters_per_pixel (float): The size of one texture pixel.
+        pose (tuple): The start pose (x, y, heading).
+        battery (float): The battery level reported by the robot.
+        sonar (float): The distance reported by the sonar.
+        **kwargs: Passed on to KinematicTransport.
+
+    Returns:
+        KinematicTransport
+    """
+    cameras = {
+        DeviceNames.TOP_IMAGE_SENSOR_OS.value: Camera((64, 64), (0.4, 0.4), 0.3),
+        DeviceNames.SMALL_IMAGE_SENSOR_OS.value: Camera((32, 32), (0.1, 0.1), 0.08),
+    }
+    transport = KinematicTransport(texture, meters_per_pixel, pose, cameras, **kwargs)
+    transport.string_signals.update({
+        'battery': str(battery).encode(),
+        'sonar_sensor': struct.pack('f', sonar),
+        'bumper_sensor': struct.pack('3f', 0, 0, 0),
+    })
+    return transport
+
+
+def _load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_object_sorter(transport=None):
+    """
+    Imports object_sort/object_sorter.py together with its own mindstorms module, which has the same name as
+    the root mindstorms.py used by this package, and sets up its devices on the transport.
+
+    Args:
+        transport (KinematicTransport): The simulator to set the devices up on, or None to only import.
+
+    Returns:
+        The object_sorter module.
+    """
+    folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'object_sort')
+    root_mindstorms = sys.modules.get('mindstorms')
+    try:
+        sys.modules['mindstorms'] = _load_module('object_sort_mindstorms', os.path.join(folder, 'mindstorms.py'))
+        module = _load_module('object_sorter', os.path.join(folder, 'object_sorter.py'))
+    finally:
+        if root_mindstorms is None:
+            sys.modules.pop('mindstorms', None)
+        else:
+            sys.modules['mindstorms'] = root_mindstorms
+    if transport is not None:
+        module.setup(transport)
+    return module
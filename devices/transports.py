@@ -0,0 +1,296 @@
+from contextlib import nullcontext
+from enum import Enum
+import numpy as np
+import sim
+from connection import batch, check_not_in_batch
+import mindstorms
+
+
+def device_name(name):
+    """
+    Returns:
+        The name of a device given as a string or as an Enum member holding the name, like DeviceNames.
+    """
+    return name.value if isinstance(name, Enum) else name
+
+
+class Transport:
+    """
+    The connection between the devices and a simulator. Motor, ImageSensor and Robot only talk to the
+    simulator through these methods, so the same controller runs on every transport.
+
+    Handles are whatever get_handle returns; devices only pass them back to the transport.
+    """
+
+    def get_handle(self, name):
+        """
+        Args:
+            name (str): The name or path of the device in the scene.
+
+        Returns:
+            The handle to pass to the other methods.
+        """
+        raise NotImplementedError
+
+    def set_motor_speed(self, handle, speed):
+        """Sets the target speed of one motor."""
+        raise NotImplementedError
+
+    def set_motor_speeds(self, speeds):
+        """
+        Sets the target speed of several motors at once.
+
+        Args:
+            speeds (dict): Maps motor handles to speeds.
+        """
+        for handle, speed in speeds.items():
+            self.set_motor_speed(handle, speed)
+
+    def read_image(self, handle):
+        """
+        Returns:
+            The current image of a camera as a uint8 array of shape (height, width, 3), top row first.
+        """
+        raise NotImplementedError
+
+    def start_prefetch(self, handle, timeout=1.0):
+        """
+        Starts reading a camera in the background, so read_image returns the newest frame without waiting.
+        Transports without background reads ignore it and keep reading on demand.
+
+        Args:
+            handle: The camera.
+            timeout (float): Maximum time in seconds to wait for the first frame.
+        """
+
+    def stop_prefetch(self, handle):
+        """Stops reading a camera in the background, if start_prefetch started it."""
+
+    def frame_age(self, handle):
+        """
+        Returns:
+            The age in seconds of the frame read_image returns next, 0 when it is read on demand.
+        """
+        return 0.0
+
+    def get_string_signal(self, name):
+        """
+        Returns:
+            The value of a string signal as bytes.
+        """
+        raise NotImplementedError
+
+    def set_integer_signal(self, name, value):
+        """Sets an integer signal."""
+        raise NotImplementedError
+
+    def batch(self):
+        """
+        Returns:
+            A context manager grouping the commands issued inside it, where the transport supports it.
+        """
+        return nullcontext()
+
+    def close(self):
+        """Releases the connection."""
+
+
+class LegacyTransport(Transport):
+    """
+    Transport over the legacy remote API (sim.py) used by the line follower scenes.
+
+    The wheel motors of those scenes are the ports 'A' (left) and 'B' (right) of one packed speed signal, and
+    the camera is the "Sensors" string signal. The transport owns one mindstorms.DriveBase writing the speed
+    signal and one mindstorms.ColorSensor reading the camera, created on the first read since the scene only
+    publishes the signal once the simulation runs, so streaming and prefetching work for every device on this
+    transport. Any other name is looked up as an object of the scene, so joints and vision sensors of other
+    scenes work as well.
+
+    Attributes:
+        drive_base (mindstorms.DriveBase): Writes the wheel speeds.
+        color_sensor (mindstorms.ColorSensor): Reads the camera, None before the first read.
+    """
+
+    MOTOR_PORTS = ('A', 'B')
+
+    def __init__(self, clientID, motor_signal="motors", sensor_signal="Sensors", write_policy=None, stream=False):
+        """
+        Args:
+            clientID (int): The client ID returned by sim.simxStart.
+            motor_signal (str): The string signal carrying the wheel speeds.
+            sensor_signal (str): The string signal carrying the camera image.
+            write_policy (mindstorms.WritePolicy): Decides which wheel speed commands are actually sent.
+            stream (bool): Stream the camera signal, see mindstorms.ColorSensor.
+        """
+        self.clientID = clientID
+        self.sensor_signal = sensor_signal
+        self.stream = stream
+        self.drive_base = mindstorms.DriveBase(clientID, signal_name=motor_signal, write_policy=write_policy)
+        self.color_sensor = None
+
+    def get_handle(self, name):
+        if name in self.MOTOR_PORTS or name == self.sensor_signal:
+            return name
+        return_code, handle = sim.simxGetObjectHandle(self.clientID, name, sim.simx_opmode_blocking)
+        if return_code != sim.simx_return_ok:
+            raise LookupError(f"No object {name} in the scene (return code {return_code})")
+        return handle
+
+    def set_motor_speed(self, handle, speed):
+        if handle in self.MOTOR_PORTS:
+            self.drive_base._set_wheel(handle, speed)
+        else:
+            sim.simxSetJointTargetVelocity(self.clientID, handle, speed, sim.simx_opmode_oneshot)
+
+    def set_motor_speeds(self, speeds):
+        ports = {handle: speed for handle, speed in speeds.items() if handle in self.MOTOR_PORTS}
+        if ports:
+            speed_l, speed_r = self.drive_base.wheel_speeds
+            self.drive_base._send(ports.get('A', speed_l), ports.get('B', speed_r))
+        for handle, speed in speeds.items():
+            if handle not in self.MOTOR_PORTS:
+                self.set_motor_speed(handle, speed)
+
+    def _color_sensor(self):
+        if self.color_sensor is None:
+            # reads the first frame
+            self.color_sensor = mindstorms.ColorSensor(self.clientID, self.stream, signal_name=self.sensor_signal)
+        else:
+            self.color_sensor.update_image()
+        return self.color_sensor
+
+    def read_image(self, handle):
+        if handle == self.sensor_signal:
+            image = self._color_sensor().image
+            if not isinstance(image, np.ndarray):
+                raise ConnectionError(f"Reading signal {handle} failed with return code {image}")
+            return image
+
+        check_not_in_batch(self.clientID, f'Reading vision sensor {handle}')
+        return_code, resolution, image = sim.simxGetVisionSensorImage(self.clientID, handle, 0,
+                                                                      sim.simx_opmode_blocking, asArray=True)
+        if return_code != sim.simx_return_ok:
+            raise ConnectionError(f"Reading vision sensor {handle} failed with return code {return_code}")
+        return np.ascontiguousarray(image[::-1])
+
+    def start_prefetch(self, handle, timeout=1.0):
+        if handle == self.sensor_signal:
+            self._color_sensor().start_prefetch(timeout)
+
+    def stop_prefetch(self, handle):
+        if handle == self.sensor_signal and self.color_sensor is not None:
+            self.color_sensor.stop_prefetch()
+
+    def frame_age(self, handle):
+        if handle == self.sensor_signal and self.color_sensor is not None:
+            return self.color_sensor.frame_age()
+        return 0.0
+
+    def get_string_signal(self, name):
+        check_not_in_batch(self.clientID, f'Reading signal {name}')
+        return_code, value = sim.simxGetStringSignal(self.clientID, name, sim.simx_opmode_blocking, asBytes=True)
+        return value
+
+    def set_integer_signal(self, name, value):
+        sim.simxSetInt32Signal(self.clientID, name, value, sim.simx_opmode_oneshot)
+
+    def batch(self):
+        return batch(self.clientID)
+
+    def close(self):
+        self.drive_base.stop()
+        if self.color_sensor is not None:
+            self.color_sensor.close()
+
+
+class ZmqTransport(Transport):
+    """
+    Transport over the ZeroMQ remote API (coppeliasim_zmqremoteapi_client) used by the object sorting scene.
+    """
+
+    def __init__(self, sim=None, host='localhost'):
+        """
+        Args:
+            sim: The sim object of a connected RemoteAPIClient; by default a new client connects to host.
+            host (str): The address of the simulator.
+        """
+        if sim is None:
+            from coppeliasim_zmqremoteapi_client import RemoteAPIClient
+            sim = RemoteAPIClient(host).require("sim")
+        self.sim = sim
+
+    def get_handle(self, name):
+        return self.sim.getObject(name)
+
+    def set_motor_speed(self, handle, speed):
+        self.sim.setJointTargetVelocity(handle, speed)
+
+    def read_image(self, handle):
+        img, res = self.sim.getVisionSensorImg(handle)
+        image = np.frombuffer(img, np.uint8).reshape([res[1], res[0], 3])
+        return np.ascontiguousarray(image[::-1])
+
+    def get_string_signal(self, name):
+        return self.sim.getStringSignal(name)
+
+    def set_integer_signal(self, name, value):
+        self.sim.setIntegerSignal(name, value)
+
+
+class InProcessTransport(Transport):
+    """
+    Transport without a simulator: motor speeds and signals are kept in dictionaries and cameras show
+    whatever image was put there last. Useful to measure the overhead of the devices themselves and as
+    the base of simulators running in the same process.
+
+    Attributes:
+        motor_speeds (dict): Maps motor names to their last target speed.
+        images (dict): Maps camera names to their current image.
+        string_signals (dict): Maps signal names to bytes.
+        integer_signals (dict): Maps signal names to ints.
+    """
+
+    def __init__(self):
+        self.motor_speeds = {}
+        self.images = {}
+        self.string_signals = {}
+        self.integer_signals = {}
+
+    def get_handle(self, name):
+        return name
+
+    def set_motor_speed(self, handle, speed):
+        self.motor_speeds[handle] = speed
+
+    def put_image(self, name, image):
+        """Makes image the current image of the camera called name."""
+        self.images[name] = image
+
+    def read_image(self, handle):
+        return self.images[handle]
+
+    def get_string_signal(self, name):
+        return self.string_signals[name]
+
+    def set_integer_signal(self, name, value):
+        self.integer_signals[name] = value
+
+
+TRANSPORTS = {
+    'legacy': LegacyTransport,
+    'zmq': ZmqTransport,
+    'inprocess': InProcessTransport,
+}
+
+
+def make_transport(kind, *args, **kwargs):
+    """
+    Creates a transport by name, e.g. make_transport('legacy', clientID) or make_transport('zmq').
+
+    Args:
+        kind (str): One of TRANSPORTS.
+        *args, **kwargs: Passed on to the transport class.
+    """
+    if kind not in TRANSPORTS:
+        raise ValueError(f"Unknown transport {kind!r}, expected one of {sorted(TRANSPORTS)}")
+    return TRANSPORTS[kind](*args, **kwargs)
@@ -1,9 +1,194 @@
+import argparse
+import io
+import os
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
+from runlog import read_header, read_run
 
-#read from error.csv file
-#     global dataframe
-dataframe = pd.read_csv('error.csv')
-#plot the error values
-plt.plot(dataframe['error'])
-plt.show()
+
+class LogTail:
+    """
+    Follows a growing error.csv or run log, reading only the bytes added since the last read.
+
+    Attributes:
+        path (str): The log file.
+        column (str): The column or record field collected.
+        offset (int): The byte offset up to which the file has been read.
+        values (np.array): All values read so far.
+    """
+
+    def __init__(self, path, column='error'):
+        self.path = path
+        self.column = column
+        self._binary = not path.endswith('.csv')
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self._samples = np.empty(4096)
+        self._count = 0
+        self._dtype = None
+        self._usecol = None
+
+    @property
+    def values(self):
+        return self._samples[:self._count]
+
+    def _extend(self, new):
+        # grows by doubling, so appending stays cheap however long the run gets
+        if self._count + len(new) > len(self._samples):
+            samples = np.empty(max(2 * len(self._samples), self._count + len(new)))
+            samples[:self._count] = self.values
+            self._samples = samples
+        self._samples[self._count:self._count + len(new)] = new
+        self._count += len(new)
+
+    def read(self):
+        """
+        Reads what was added to the file since the last call.
+
+        Returns:
+            int: The number of new values.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        size = os.path.getsize(self.path)
+        if size < self.offset:
+            # the file was replaced by a new run
+            self._reset()
+        new = self._read_binary(size) if self._binary else self._read_csv()
+        self._extend(new)
+        return len(new)
+
+    def _read_csv(self):
+        with open(self.path, 'rb') as file:
+            file.seek(self.offset)
+            chunk = file.read()
+        # a line is only complete once its newline is written
+        chunk = chunk[:chunk.rfind(b'\n') + 1]
+        if self._usecol is None:
+            if not chunk:
+                return np.empty(0)
+            header, _, chunk = chunk.partition(b'\n')
+            self._usecol = header.decode().split(',').index(self.column)
+            self.offset += len(header) + 1
+        self.offset += len(chunk)
+        if not chunk.strip():
+            return np.empty(0)
+        return np.loadtxt(io.BytesIO(chunk), delimiter=',', usecols=self._usecol, ndmin=1)
+
+    def _read_binary(self, size):
+        if self._dtype is None:
+            _, self._dtype, self.offset = read_header(self.path)
+        count = (size - self.offset) // self._dtype.itemsize
+        if count <= 0:
+            return np.empty(0)
+        with open(self.path, 'rb') as file:
+            file.seek(self.offset)
+            records = np.fromfile(file, self._dtype, count)
+        self.offset += count * self._dtype.itemsize
+        return records[self.column].astype(np.float64)
+
+
+def decimate(values, points, start=0):
+    """
+    Reduces values to about points samples for display, keeping the minimum and maximum of every bucket so
+    spikes stay visible.
+
+    Args:
+        values (np.array): The samples.
+        points (int): The number of samples to return at most, about the width of the plot in pixels.
+        start (int): The index of the first sample, used for the returned x coordinates.
+
+    Returns:
+        (np.array, np.array): The x coordinates and values to plot.
+    """
+    if len(values) <= points:
+        return np.arange(start, start + len(values)), values
+    size = -(-len(values) // max(points // 2, 1))
+    # the samples left over go into a shorter first bucket, so none are dropped
+    starts = np.arange(len(values) % size, len(values), size)
+    if starts[0] > 0:
+        starts = np.concatenate([[0], starts])
+    lengths = np.diff(np.append(starts, len(values)))
+    x = np.column_stack([start + starts, start + starts + lengths // 2]).ravel()
+    y = np.column_stack([np.minimum.reduceat(values, starts), np.maximum.reduceat(values, starts)]).ravel()
+    return x, y
+
+
+def plot(path):
+    """Plots a finished run, from error.csv or a run log."""
+    if path.endswith('.csv'):
+        error = pd.read_csv(path)['error']
+    else:
+        # mapped, not read: only the pages needed for the plot are loaded
+        metadata, records = read_run(path)
+        error = records['error']
+        plt.title(', '.join(f'{key}={value}' for key, value in metadata.items() if key != 'start_time'))
+    plt.plot(error)
+    plt.show()
+
+
+def plot_live(path, rate=10, window=None, points=2000):
+    """
+    Plots a run while it is being logged, adding the new samples rate times per second.
+
+    Args:
+        path (str): error.csv or a run log.
+        rate (float): Refreshes per second.
+        window (int): Only show the last window samples, or all of them if None.
+        points (int): The number of samples drawn at most.
+    """
+    tail = LogTail(path)
+    figure, axes = plt.subplots()
+    line, = axes.plot([], [])
+    axes.set_xlabel('tick')
+    axes.set_ylabel(tail.column)
+
+    def update(frame):
+        if tail.read() == 0 and frame > 0:
+            return line,
+        values = tail.values
+        start = 0 if window is None else max(0, len(values) - window)
+        x, y = decimate(values[start:], points, start)
+        line.set_data(x, y)
+        if len(x):
+            axes.set_xlim(x[0], max(x[-1], x[0] + 1))
+            low, high = y.min(), y.max()
+            margin = (high - low) * 0.05 or 1
+            axes.set_ylim(low - margin, high + margin)
+        axes.set_title(f'{path}: {len(values)} samples')
+        return line,
+
+    # kept in a variable, otherwise the animation is garbage collected
+    animation = FuncAnimation(figure, update, interval=1000 / rate, cache_frame_data=False)
+    plt.show()
+    return animation
+
+
+def default_path(candidates=('error.run', 'error.csv')):
+    """
+    Returns:
+        str: The most recently modified of the candidates, or the first one if none exists yet.
+    """
+    existing = [path for path in candidates if os.path.exists(path)]
+    if not existing:
+        return candidates[0]
+    return max(existing, key=os.path.getmtime)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Plots the error of a line follower run.')
+    parser.add_argument('path', nargs='?', default=default_path(),
+                        help='error.csv or a run log like error.run; by default the newer of the two, or error.run')
+    parser.add_argument('--live', action='store_true', help='follow the log while the run is going on')
+    parser.add_argument('--rate', type=float, default=10, help='refreshes per second in live mode')
+    parser.add_argument('--window', type=int, help='only show the last WINDOW samples in live mode')
+    parser.add_argument('--points', type=int, default=2000, help='samples drawn at most in live mode')
+    args = parser.parse_args()
+    if args.live:
+        plot_live(args.path, args.rate, args.window, args.points)
+    else:
+        plot(args.path)
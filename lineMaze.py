@@ -1,11 +1,11 @@
 import sim
 import matplotlib.pyplot as plt
-from mindstorms import Motor, Direction, ColorSensor
+from devices import LegacyTransport, DriveBase, ColorSensor, Direction
+from connection import SynchronousRunner
+from runlog import RunLogWriter
+from pid import PID
 import numpy as np
-import pandas as pd
 import cv2
-sim.simxFinish(-1)
-clientID = sim.simxStart('127.0.0.1', 19999, True, True, 5000, 5)
 
 
 def show_image(image):
@@ -58,30 +58,24 @@ def is_blue_detected(color_sensor):
     blue_intensity = blue / (red + green)
 
     return blue_intensity > blue_ratio_threshold
-def log_error(error,KP,KD,KI):
+def log_error(error):
     """
-    Log the error and the control values to a dataframe
+    Log the error to the run log, if one was opened; the control values are in its header
     """
-    #concat the new data to the dataframe
-    global dataframe
-    dataframe = pd.concat([dataframe, pd.DataFrame({'error': [error],
-                                                    'KP': [KP],
-                                                    'KD': [KD],
-                                                    'KI': [KI]})],
-                          ignore_index=True)
-    #write to file,overwrite
-    dataframe.to_csv('error.csv', index=False)
+    if telemetry is not None:
+        telemetry.append(error)
     
-def follow_line(color_sensor, left_motor, right_motor, base_speed, integral, prev_error, KP, KD, KI):
+def follow_line(color_sensor, drive_base, base_speed, pid):
     """
     A very simple line follower that should be improved.
     """
     
-    color_sensor.image = color_sensor._get_image_sensor()
+    # picks up the newest prefetched frame if color_sensor.start_prefetch() was called on a LegacyTransport
+    color_sensor.update_image()
     print(f'Color sensor dimensions: {color_sensor.image.shape}')
-    print(process_image(color_sensor.image.astype(np.uint8)))
+    print(process_image(color_sensor.image))
     
-    image = color_sensor.image.astype(np.uint8)
+    image = color_sensor.image
     print(f"blackness value by color sensor: {color_sensor.reflection()}")
     #process_image(image)
     blackness = process_image(image)
@@ -89,53 +83,65 @@ def follow_line(color_sensor, left_motor, right_motor, base_speed, integral, pre
     threshold = 40
     error = abs(threshold - blackness)
 
-    log_error(error,KP,KD,KI)
-    derivative = error - prev_error
-    prev_error = error
-    integral += error
-    proportional = error
-    update = KP * proportional + KD * derivative + KI * integral
+    log_error(error)
+    update = pid.update(error)
     
-    if blackness < threshold:
-        left_motor.run(base_speed + update)
-        right_motor.run(base_speed - update)
-    elif blackness > threshold:
-        left_motor.run(base_speed - update)
-        right_motor.run(base_speed + update)
-    else:
-        left_motor.run(base_speed)
-        right_motor.run(base_speed)
+    # one write for both wheels, sent without waiting for the reply
+    with drive_base.batch():
+        if blackness < threshold:
+            drive_base.drive(base_speed, update)
+        elif blackness > threshold:
+            drive_base.drive(base_speed, -update)
+        else:
+            drive_base.drive(base_speed, 0)
     
-    return prev_error, integral
-dataframe = pd.DataFrame(columns=['error', 'KP', 'KD', 'KI'])        
+    return error
+# records are buffered and written to error.run in the background; None disables logging
+telemetry = None
 # MAIN CONTROL LOOP
-if clientID != -1:
-
-    print('Connected')
-    # Perfect blackness = 45
-    left_motor = Motor(motor_port='A', direction=Direction.CLOCKWISE, clientID=clientID)
-    right_motor = Motor(motor_port='B', direction=Direction.CLOCKWISE, clientID=clientID)
-    color_sensor = ColorSensor(clientID=clientID)
-    base_speed = 0.5
-    integral = 0
-    prev_error = 0
-    t = 0
-    KP = 0.015
-    KD = 0.0075
-    KI = 0.0001
-    
-    while True:
-        t += 1
-        # End connection
-        print('-' *10)
-        print(f'Time: {t}')
-        prev_error, integral = follow_line(color_sensor, left_motor, right_motor, base_speed, integral, prev_error, KP, KD, KI)
+# guarded so follow_line and process_image can be imported, e.g. to run them on devices.kinematic
+if __name__ == "__main__":
+    sim.simxFinish(-1)
+    clientID = sim.simxStart('127.0.0.1', 19999, True, True, 5000, 5)
 
+    if clientID != -1:
 
+        print('Connected')
+        # Perfect blackness = 45
+        transport = LegacyTransport(clientID)
+        drive_base = DriveBase(transport, left_direction=Direction.CLOCKWISE, right_direction=Direction.CLOCKWISE)
+        base_speed = 0.5
+        # gains per second, the same as 0.015, 0.0075 and 0.0001 per tick at the 50 ms simulation step
+        DT = 0.05
+        KP = 0.015
+        KD = 0.0075 * DT
+        KI = 0.0001 / DT
+        # one tick per simulation step, so the controller runs on simulation time; no integral clamp, no
+        # derivative filter and a previous error of 0 at the start, like the controller this replaced
+        pid = PID(KP, KD, KI, dt=DT, initial_error=0)
+        # convert to CSV with: python runlog.py error.run error.csv
+        telemetry = RunLogWriter('error.run', [('error', '<f4')],
+                                 {'KP': KP, 'KD': KD, 'KI': KI, 'dt': DT, 'integral_limit': pid.integral_limit,
+                                  'derivative_tau': pid.derivative_tau, 'base_speed': base_speed})
 
+        def tick(t):
+            print('-' *10)
+            print(f'Time: {t}')
+            follow_line(color_sensor, drive_base, base_speed, pid)
 
-else:
-    print('Failed connecting to remote API server')
-print('Program ended')
-
-# MAIN CONTROL LOOP
\ No newline at end of file
+        # one simulation step per control tick, so runs are deterministic and not bound to real time
+        runner = SynchronousRunner(clientID)
+        try:
+            with runner:
+                # the scene publishes the "Sensors" signal from its first step, which in synchronous mode
+                # only runs once triggered
+                runner.step()
+                color_sensor = ColorSensor(transport)
+                runner.run(tick)
+        finally:
+            # also reached on Ctrl-C, so the last rows are written
+            telemetry.close()
+            print(f'{runner.steps} sim steps at {runner.steps_per_second():.1f} steps per wall-second')
+    else:
+        print('Failed connecting to remote API server')
+    print('Program ended')
@@ -1,5 +1,8 @@
+import threading
+import time
 import sim as sim
 import numpy as np
+from connection import StringSignalSubscription, batch, check_not_in_batch, operation_mode
 import matplotlib.pyplot as plt
 from enum import Enum
 
@@ -17,6 +20,23 @@ class Direction(Enum):
     COUNTERCLOCKWISE = -1
 
 
+class Color(Enum):
+    """
+       Enum representing the colors a ColorSensor can tell apart, like the pyBricks Color class.
+
+       Attributes:
+           NONE: No known color, e.g. too far from every color definition.
+       """
+
+    NONE = 0
+    BLACK = 1
+    WHITE = 2
+    RED = 3
+    GREEN = 4
+    BLUE = 5
+    YELLOW = 6
+
+
 # ACTUATORS
 
 class CoppeliaComponent:
@@ -24,24 +44,197 @@ class CoppeliaComponent:
         self.clientID = clientID
 
 
+class WritePolicy:
+    """
+      Decides when a DriveBase actually sends its wheel speeds. Sends don't wait for a reply, and speeds that
+      barely changed are not resent, except every keepalive commands so the simulation recovers from a lost packet.
+
+      Attributes:
+          operation_mode (int): The operation mode of the writes outside a batch, simx_opmode_oneshot by default.
+          epsilon (float): Commands changing no wheel speed by at least this much are skipped.
+          keepalive (int): Skipped commands are sent anyway every keepalive commands; None to never resend.
+      """
+
+    def __init__(self, operation_mode=sim.simx_opmode_oneshot, epsilon=1e-3, keepalive=10):
+        self.operation_mode = operation_mode
+        self.epsilon = epsilon
+        self.keepalive = keepalive
+
+    def should_send(self, speeds, sent_speeds, skipped):
+        """
+            Args:
+                speeds (list): The wheel speeds of the current command.
+                sent_speeds (list): The wheel speeds sent last, or None if nothing was sent yet.
+                skipped (int): The number of commands skipped since the last send.
+
+            Returns:
+                True if the current command has to be sent.
+        """
+
+        if sent_speeds is None:
+            return True
+        if self.keepalive is not None and skipped + 1 >= self.keepalive:
+            return True
+        return any(abs(speed - sent) >= self.epsilon for speed, sent in zip(speeds, sent_speeds))
+
+
+class DriveBase(CoppeliaComponent):
+    """
+      The two wheel motors of one robot. Both wheel speeds travel in a single packed string signal,
+      so every command is exactly one signal write.
+
+      Attributes:
+          signal_name (str): The string signal carrying the wheel speeds, "motors" in our scenes.
+          left_direction (Direction): The rotation direction of the left wheel (motor port A).
+          right_direction (Direction): The rotation direction of the right wheel (motor port B).
+          wheel_speeds (list): The last speeds commanded for the left and right wheel, directions applied.
+          write_policy (WritePolicy): Decides which commands are actually sent.
+      """
+
+    _drive_bases = {}
+
+    def __init__(self, clientID, left_direction=Direction.CLOCKWISE, right_direction=Direction.CLOCKWISE,
+                 signal_name="motors", write_policy=None):
+        """
+            Initializes a DriveBase and registers it as the drive base of the robot listening on the given signal.
+
+            Args:
+            clientID (int): The client ID returned by sim.simxStart.
+            left_direction (Direction): The rotation direction of the left wheel.
+            right_direction (Direction): The rotation direction of the right wheel.
+            signal_name (str): The string signal carrying the wheel speeds. Give every robot of a scene its own.
+            write_policy (WritePolicy): Decides which commands are actually sent, by default WritePolicy().
+        """
+
+        super().__init__(clientID)
+        assert isinstance(left_direction, Direction), "Direction must be an instance of Direction enum"
+        assert isinstance(right_direction, Direction), "Direction must be an instance of Direction enum"
+
+        self.signal_name = signal_name
+        self.left_direction = left_direction
+        self.right_direction = right_direction
+        self.wheel_speeds = [0, 0]
+        self.write_policy = write_policy if write_policy is not None else WritePolicy()
+        self._sent_speeds = None
+        self._skipped = 0
+
+        DriveBase._drive_bases[(clientID, signal_name)] = self
+
+    @classmethod
+    def of(cls, clientID, signal_name="motors"):
+        """
+            Returns the drive base registered for the given client and signal, creating it if needed.
+        """
+
+        drive_base = cls._drive_bases.get((clientID, signal_name))
+        if drive_base is None:
+            drive_base = cls(clientID, signal_name=signal_name)
+        return drive_base
+
+    def _send(self, speed_l, speed_r, force=False):
+        """
+            Private method to send the speed of the left and right wheels to the simulation in one write,
+            unless the write policy skips it.
+
+            Args:
+                speed_l (float): The speed of the left wheel, direction already applied.
+                speed_r (float): The speed of the right wheel, direction already applied.
+                force (bool): Send even if the write policy would skip the command.
+        """
+
+        self.wheel_speeds = [speed_l, speed_r]
+        if not (force or self.write_policy.should_send(self.wheel_speeds, self._sent_speeds, self._skipped)):
+            self._skipped += 1
+            return
+
+        velocities = sim.simxPackFloats(self.wheel_speeds)
+        sim.simxSetStringSignal(clientID=self.clientID, signalName=self.signal_name, signalValue=velocities,
+                                operationMode=operation_mode(self.clientID, self.write_policy.operation_mode))
+        self._sent_speeds = self.wheel_speeds
+        self._skipped = 0
+
+    def flush(self):
+        """
+            Sends the current wheel speeds, even if the write policy skipped them.
+        """
+
+        self._send(*self.wheel_speeds, force=True)
+
+    def _set_wheel(self, motor_port, speed):
+        """
+            Private method to change the speed of one wheel, keeping the other one.
+
+            Args:
+                motor_port (str): 'A' for the left wheel, 'B' for the right wheel.
+                speed (float): The speed of the wheel, direction already applied.
+        """
+
+        if motor_port == 'A':
+            self._send(speed, self.wheel_speeds[1])
+        else:
+            self._send(self.wheel_speeds[0], speed)
+
+    def tank(self, left, right):
+        """
+            Sets the speed of both wheels.
+
+            Args:
+            left (float): The desired speed for the left wheel.
+            right (float): The desired speed for the right wheel.
+        """
+
+        self._send(left * self.left_direction.value, right * self.right_direction.value)
+
+    def drive(self, speed, turn_rate):
+        """
+            Drives with the given forward speed while turning, like the pyBricks DriveBase.
+
+            Args:
+            speed (float): The desired forward speed.
+            turn_rate (float): The speed difference added to the left and subtracted from the right wheel,
+                positive values turn clockwise.
+        """
+
+        self.tank(speed + turn_rate, speed - turn_rate)
+
+    def stop(self):
+        """
+            Stops both wheels. Always sent, whatever the write policy.
+        """
+
+        self._send(0, 0, force=True)
+
+    def batch(self):
+        """
+            Returns a context manager sending all commands issued inside it in one packet, see connection.batch.
+        """
+
+        return batch(self.clientID)
+
+
 class Motor(CoppeliaComponent):
     """
       Simplified version of the pyBricks motor class, especially adapted to Coppelia.
 
+      The wheel motors of a robot share one speed signal, so every Motor belongs to the DriveBase of its robot
+      and a run() writes the speeds of both wheels. Prefer DriveBase.drive or DriveBase.tank, which set both
+      wheels with a single write.
+
       Attributes:
           motor_port (int): The motor port number, either 1 or 2.
           direction (Direction): The direction of the motor rotation, either CLOCKWISE or COUNTERCLOCKWISE.
+          drive_base (DriveBase): The drive base this motor is a wheel of.
       """
 
-    other_motor = None
-
-    def __init__(self, motor_port, direction, clientID):
+    def __init__(self, motor_port, direction, clientID, drive_base=None):
         """
             Initializes a Motor instance with the specified motor port and direction.
 
             Args:
             motor_port (int): The motor port number, either 1 or 2 (that's applicable only for the coppelia sim).
             direction (Direction): The direction of the motor rotation, either CLOCKWISE or COUNTERCLOCKWISE.
+            drive_base (DriveBase): The drive base of the robot, by default the one registered for this client
+                under the "motors" signal.
         """
 
         super().__init__(clientID)
@@ -51,84 +244,266 @@ class Motor(CoppeliaComponent):
         self.motor_port = motor_port
         self.direction = direction
         self.speed = 0
+        self.drive_base = drive_base if drive_base is not None else DriveBase.of(clientID)
 
-        if Motor.other_motor is None:
-            Motor.other_motor = self
-        else:
-            self.other_motor = Motor.other_motor
-            Motor.other_motor.other_motor = self
-
-    def __set_speed(self, speed_l, speed_r):
+    def run(self, speed):
         """
-            Private method to set the speed of the left and right motors in the simulation.
+            Sets the speed of the motor based on the motor port and direction.
 
             Args:
-                speed_l (float): The desired speed for the left motor.
-                speed_r (float): The desired speed for the right motor.
+            speed (float): The desired speed for the motor.
         """
 
-        velocities = sim.simxPackFloats([speed_l, speed_r])
-        sim.simxSetStringSignal(clientID=self.clientID, signalName="motors", signalValue=velocities,
-                                operationMode=sim.simx_opmode_blocking)
+        self.speed = speed
+        self.drive_base._set_wheel(self.motor_port, self.speed * self.direction.value)
 
-    def run(self, speed):
+
+# SENSORS
+
+class ColorClassifier:
+    """
+    Classifies the pixels of an RGB image with a quantized lookup table. The table maps every bin of a
+    bins x bins x bins RGB cube to the nearest color definition and is built once, so classifying a
+    pixel costs one table lookup instead of a chain of ratio comparisons.
+
+    Attributes:
+        colors (list): The classes of the table, Color.NONE first.
+        bins (int): The number of bins per channel, a power of two up to 256.
+        lut (np.ndarray): uint8 array of shape (bins, bins, bins) holding indices into colors.
+    """
+
+    DEFAULT_DEFINITIONS = {
+        Color.BLACK: (0, 0, 0),
+        Color.WHITE: (255, 255, 255),
+        Color.RED: (255, 0, 0),
+        Color.GREEN: (0, 255, 0),
+        Color.BLUE: (0, 0, 255),
+        Color.YELLOW: (255, 255, 0),
+    }
+
+    def __init__(self, definitions=None, bins=32, max_distance=None):
         """
-            Sets the speed of the motor based on the motor port and direction.
+        Builds the lookup table.
 
-            Args:
-            speed (float): The desired speed for the motor.
+        Args:
+            definitions (dict): Maps every Color to its reference RGB value (0-255), by default DEFAULT_DEFINITIONS.
+            bins (int): The number of bins per channel, a power of two up to 256.
+            max_distance (float): Bins further than this from every reference color, in RGB units, are
+                classified as Color.NONE. By default every bin gets its nearest color.
         """
+        assert 0 < bins <= 256 and bins & (bins - 1) == 0, "bins must be a power of two up to 256"
+        if definitions is None:
+            definitions = self.DEFAULT_DEFINITIONS
+
+        self.colors = [Color.NONE] + list(definitions)
+        self.bins = bins
+        self._shift = 8 - (bins.bit_length() - 1)
+
+        # one reference at a time with a running minimum: a few bins^3 arrays instead of the differences to all
+        # references at once, which took about 2.4 GB at 256 bins; float32 holds the squared distances exactly
+        centers = ((np.arange(bins) + 0.5) * (256 / bins)).astype(np.float32)
+        nearest = np.full((bins, bins, bins), np.inf, dtype=np.float32)
+        lut = np.zeros((bins, bins, bins), dtype=np.uint8)
+        for index, color in enumerate(self.colors[1:], 1):
+            red, green, blue = definitions[color]
+            squared = (((centers - red) ** 2)[:, None, None] + ((centers - green) ** 2)[None, :, None]
+                       + ((centers - blue) ** 2)[None, None, :])
+            closer = squared < nearest
+            nearest[closer] = squared[closer]
+            lut[closer] = index
+        if max_distance is not None:
+            lut[nearest > max_distance ** 2] = 0
+        self.lut = lut
+
+    def classify(self, image):
+        """
+        Args:
+            image (np.ndarray): uint8 array of shape (..., 3).
 
-        self.speed = speed
-        speed_l = self.speed * self.direction.value
-        speed_r = self.other_motor.speed * self.other_motor.direction.value
+        Returns:
+            uint8 array of the image shape without the channel axis, holding indices into colors.
+        """
+        bins = image >> self._shift
+        return self.lut[bins[..., 0], bins[..., 1], bins[..., 2]]
 
-        if self.motor_port == 'A':
-            self.__set_speed(speed_l, speed_r)
-        else:
-            self.__set_speed(speed_r, speed_l)
+    def fractions(self, image):
+        """
+        Returns:
+            dict: Maps every Color to the fraction of pixels of the image classified as it.
+        """
+        counts = np.bincount(self.classify(image).ravel(), minlength=len(self.colors))
+        return dict(zip(self.colors, counts / counts.sum()))
 
 
-# SENSORS
+_default_color_classifier = None
 
-class ColorSensor(CoppeliaComponent):
-    """Color Sensor for the CoppeliaSim environment."""
 
-    def __init__(self, clientID):
-        """Initialize a ColorSensor instance."""
-        super().__init__(clientID)
+def default_color_classifier():
+    """
+    Returns:
+        The ColorClassifier with the default color definitions, built on first use.
+    """
+    global _default_color_classifier
+    if _default_color_classifier is None:
+        _default_color_classifier = ColorClassifier()
+    return _default_color_classifier
 
-        self.image = self._get_image_sensor()
 
-    def _get_image_sensor(self):
-        return_code, return_value = sim.simxGetStringSignal(clientID=self.clientID, signalName="Sensors",
-                                                            operationMode=sim.simx_opmode_blocking)
-        if return_code == 0:
-            image = sim.simxUnpackFloats(return_value)
-            res = int(np.sqrt(len(image) / 3))
-            return self.image_correction(image, res)
-        else:
-            return return_code
+class ImageStatistics:
+    """
+    Measurements on an RGB image, shared by the image sensors.
+
+    Every assignment to image counts as a new frame. The statistics of a frame are computed from one
+    pass over the image the first time they are needed and served from a cache until the next frame
+    is assigned, so always assign a new image instead of modifying the current one in place.
+
+    Attributes:
+        frame (int): The number of frames assigned so far.
+        color_classifier (ColorClassifier): The classifier used by color(), None for the one returned
+            by default_color_classifier().
+    """
+
+    frame = 0
+    color_classifier = None
+    _cache_frame = -1
+    _cache = None
+
+    @property
+    def image(self):
+        return self._image
+
+    @image.setter
+    def image(self, image):
+        self._image = image
+        self.frame += 1
+
+    def _cached(self, key, compute):
+        """
+        Returns the value cached under key for the current frame, computing it first if needed.
+        """
+        if self._cache_frame != self.frame:
+            self._cache = {}
+            self._cache_frame = self.frame
+        value = self._cache.get(key)
+        if value is None:
+            value = self._cache[key] = compute()
+        return value
+
+    def _get_column_sums(self):
+        """
+        Sums every column of the current frame per channel, once per frame.
+
+        Returns:
+            An int64 array of shape (width, 3).
+        """
+        return self._cached("column_sums", lambda: self._image.sum(axis=0, dtype=np.int64))
+
+    def _get_summed_area_table(self):
+        """
+        Computes the summed-area table of the current frame, once per frame. Entry [y, x] holds the
+        per-channel sum of all pixels above and left of pixel (y, x), so the sum of any rectangle takes
+        four lookups.
+
+        Returns:
+            An int64 array of shape (height + 1, width + 1, 3).
+        """
+        def compute():
+            height, width, channels = self._image.shape
+            table = np.zeros((height + 1, width + 1, channels), dtype=np.int64)
+            np.cumsum(self._image, axis=0, dtype=np.int64, out=table[1:, 1:])
+            np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+            return table
 
-    def image_correction(self, image, res):
+        return self._cached("summed_area_table", compute)
+
+    def _rectangle_means(self, top, bottom, left, right):
+        """
+        Computes the per-channel means of rectangles in one vectorized lookup of the summed-area table.
+
+        Args:
+            top, bottom, left, right: Broadcastable integer arrays of pixel edges, bottom and right exclusive.
+
+        Returns:
+            The means, between 0 and 255, with the broadcast shape of the edges plus a channel axis.
         """
-        This function can be applied to images coming directly out of CoppeliaSim.
-        It turns the 1-dimensional array into a more useful res*res*3 array, with the first
-        two dimensions corresponding to the coordinates of a pixel and the third dimension to the
-        RGB values. Aspect ratio of the image is assumed to be square (1x1).
+        table = self._get_summed_area_table()
+        sums = table[bottom, right] - table[top, right] - table[bottom, left] + table[top, left]
+        areas = (bottom - top) * (right - left)
+        return sums / np.asarray(areas)[..., None]
 
-        :param image: the image as a 1D array
-        :param res: the resolution of the image, e.g. 64
-        :return: an array of shape res*res*3
+    def grid(self, rows, cols):
         """
+        Divides the frame into a rows x cols grid and measures every cell, e.g. grid(1, 5) gives the
+        reflection across five vertical stripes as a line position feature. Cell edges are spread as
+        evenly as the resolution allows, so the same grid works at any sensor resolution.
 
-        image = [int(x * 255) for x in image]
-        image = np.array(image).reshape((res, res, 3))
-        image = np.flip(m=image, axis=0)
-        return image
+        Args:
+            rows (int): The number of rows of the grid, at most the image height.
+            cols (int): The number of columns of the grid, at most the image width.
+
+        Returns:
+            (reflection, rgb): The reflection of every cell as an array of shape (rows, cols) and the red,
+            green and blue reflection as an array of shape (rows, cols, 3), all in percent.
+        """
+        height, width = self._image.shape[:2]
+        if not (0 < rows <= height and 0 < cols <= width):
+            raise ValueError(f"A {rows}x{cols} grid does not fit an image of {height}x{width} pixels")
+
+        row_edges = np.linspace(0, height, rows + 1).round().astype(int)
+        col_edges = np.linspace(0, width, cols + 1).round().astype(int)
+        means = self._rectangle_means(row_edges[:-1, None], row_edges[1:, None], col_edges[None, :-1], col_edges[None, 1:])
+        rgb = means / 255 * 100
+        return rgb[:, :, 0], rgb
+
+    def regions(self, rectangles):
+        """
+        Measures named rectangles of the frame. The rectangles are given as fractions of the image, so
+        they stay the same area of the camera view at any sensor resolution.
+
+        Args:
+            rectangles (dict): Maps a name to (top, bottom, left, right), each between 0 and 1,
+                e.g. {"left": (0, 1, 0, 0.5), "right": (0, 1, 0.5, 1)}.
+
+        Returns:
+            dict: Maps every name to (reflection, (red, green, blue)), all in percent.
+        """
+        height, width = self._image.shape[:2]
+        names = list(rectangles)
+        edges = np.array([rectangles[name] for name in names], dtype=float).reshape(-1, 4)
+        # every rectangle covers at least one pixel
+        top = np.minimum((edges[:, 0] * height).round().astype(int), height - 1)
+        left = np.minimum((edges[:, 2] * width).round().astype(int), width - 1)
+        bottom = np.maximum((edges[:, 1] * height).round().astype(int), top + 1)
+        right = np.maximum((edges[:, 3] * width).round().astype(int), left + 1)
+        rgb = self._rectangle_means(top, bottom, left, right) / 255 * 100
+        return {name: (rgb[i, 0], tuple(rgb[i])) for i, name in enumerate(names)}
+
+    def _get_channel_means(self):
+        """
+        Returns:
+            The mean of the red, green and blue channel of the current frame, each between 0 and 255.
+        """
+        return self._get_column_sums().sum(axis=0) / (self._image.shape[0] * self._image.shape[1])
+
+    def color_fractions(self):
+        """
+        Classifies every pixel of the image.
+
+        Returns:
+            dict: Maps every Color to the fraction of pixels of that color, between 0 and 1.
+        """
+        classifier = self.color_classifier or default_color_classifier()
+        return self._cached("color_fractions", lambda: classifier.fractions(self._image))
 
     def color(self):
-        pass  # TODO
+        """
+        Measures the color of a surface.
+
+        Returns:
+            Color: The color covering most of the image.
+        """
+        fractions = self.color_fractions()
+        return max(fractions, key=fractions.get)
 
     def ambient(self):
         """
@@ -138,7 +513,7 @@ class ColorSensor(CoppeliaComponent):
                   intensity (float): The ambient light intensity, ranging from 0% (dark) to 100% (bright)
               """
 
-        return np.mean(self.image) / 255 * 100
+        return self._get_channel_means().mean() / 255 * 100
 
     def reflection(self):
         """
@@ -148,14 +523,21 @@ class ColorSensor(CoppeliaComponent):
             Reflection, ranging from 0% (no reflection) to
             100% (high reflection).
         """
-        return np.mean(self.image[:, :, 0] / 255 * 100)
+        return self._get_channel_means()[0] / 255 * 100
 
     def side_reflection(self, left):
-        if left:
-            return np.mean(self.image[:, :9, 0] / 255 * 100)
-        else:
-            return np.mean(self.image[:, 9:, 0] / 255 * 100)
-        
+        """
+        Measures the reflection of the left or right half of the image.
+
+        Args:
+            left (bool): True for the left half, False for the right half.
+
+        Returns:
+            Reflection, ranging from 0% (no reflection) to 100% (high reflection).
+        """
+        reflection, _ = self.grid(1, 2)
+        return reflection[0, 0] if left else reflection[0, 1]
+
     def rgb(self):
         """
         Measure the reflection of a surface using red, green, and blue channels of the image.
@@ -165,15 +547,214 @@ class ColorSensor(CoppeliaComponent):
             ranging from 0.0% (no reflection) to 100.0% (high reflection).
         """
 
-        red = np.mean(self.image[:, :, 0]) / 255 * 100
-        green = np.mean(self.image[:, :, 1]) / 255 * 100
-        blue = np.mean(self.image[:, :, 2]) / 255 * 100
+        red, green, blue = self._get_channel_means() / 255 * 100
 
         return red, green, blue
 
 
+class ColorSensor(CoppeliaComponent, ImageStatistics):
+    """Color Sensor for the CoppeliaSim environment."""
+
+    def __init__(self, clientID, stream=False, color_classifier=None, signal_name="Sensors"):
+        """
+        Initialize a ColorSensor instance.
+
+        Args:
+            clientID (int): The client ID returned by sim.simxStart.
+            stream (bool): If True, the "Sensors" signal is streamed from the server and every read
+                returns the latest frame from the local buffer instead of waiting for a round trip.
+            color_classifier (ColorClassifier): The classifier used by color(), by default the one
+                returned by default_color_classifier().
+            signal_name (str): The string signal carrying the camera image, "Sensors" in our scenes.
+        """
+        super().__init__(clientID)
+
+        self.signal_name = signal_name
+
+        self.color_classifier = color_classifier
+        self.frame_time = None
+
+        self._prefetch_thread = None
+        self._prefetch_stop = threading.Event()
+        self._prefetch_slots = [(None, None), (None, None)]
+        self._prefetch_front = 0
+
+        self.subscription = None
+        if stream:
+            self.subscription = StringSignalSubscription(clientID, signal_name)
+            self.subscription.wait()
+
+        self.update_image()
+
+    def _read_signal(self, operationMode=sim.simx_opmode_blocking):
+        """
+        Reads the "Sensors" signal: from the local buffer when streaming, with the given operation mode otherwise.
+
+        Returns:
+            (return_code, value, received_at): The reply, and the time.monotonic() at which it arrived, which
+            only changes with a new frame when streaming.
+
+        Raises:
+            RuntimeError: If a blocking read is issued inside a batch of the calling thread.
+        """
+        if self.subscription is not None:
+            return_code, return_value = self.subscription.read()
+            return return_code, return_value, self.subscription.received_at
+        if operationMode == sim.simx_opmode_blocking:
+            check_not_in_batch(self.clientID, f'Reading the {self.signal_name} signal')
+        return_code, return_value = sim.simxGetStringSignal(clientID=self.clientID, signalName=self.signal_name,
+                                                            operationMode=operationMode)
+        return return_code, return_value, time.monotonic()
+
+    def _decode(self, return_value):
+        image = sim.simxUnpackFloats(return_value, asArray=True)
+        res = int(np.sqrt(len(image) / 3))
+        return self.image_correction(image, res)
+
+    def _get_image_sensor(self, operationMode=sim.simx_opmode_blocking):
+        return_code, return_value, _ = self._read_signal(operationMode)
+        if return_code == 0:
+            return self._decode(return_value)
+        else:
+            return return_code
+
+    def update_image(self):
+        """
+        Makes the newest frame the current image: the newest complete frame of the prefetch thread when
+        prefetching, a freshly fetched frame otherwise. A frame that was already picked up, prefetched or
+        streamed, is not assigned again, so its cached statistics stay valid.
+
+        Returns:
+            float: The time.monotonic() at which the current frame arrived.
+        """
+        if self._prefetch_thread is None:
+            return_code, return_value, received_at = self._read_signal()
+            if return_code != 0:
+                self.image = return_code
+                self.frame_time = None
+            elif received_at != self.frame_time:
+                self.image = self._decode(return_value)
+                self.frame_time = received_at
+        else:
+            image, frame_time = self.latest_frame()
+            if frame_time != self.frame_time:
+                self.image = image
+                self.frame_time = frame_time
+        return self.frame_time
+
+    def _prefetch(self, poll_interval=0.001, max_backoff=0.1):
+        """
+        Body of the prefetch thread: fetches frames into the back slot of a two-slot buffer and publishes each
+        new complete frame by swapping it to the front. When streaming, a frame is only new once the
+        subscription received it; until then the thread polls every poll_interval seconds. Failed reads are
+        retried with a backoff doubling up to max_backoff seconds.
+
+        The thread reads with simx_opmode_blocking itself, whatever batch the control thread has open.
+        """
+        backoff = poll_interval
+        published = None
+        while not self._prefetch_stop.is_set():
+            return_code, return_value, received_at = self._read_signal(sim.simx_opmode_blocking)
+            if return_code != 0:
+                self._prefetch_stop.wait(backoff)
+                backoff = min(2 * backoff, max_backoff)
+                continue
+            backoff = poll_interval
+            if received_at == published:
+                self._prefetch_stop.wait(poll_interval)
+                continue
+            back = 1 - self._prefetch_front
+            self._prefetch_slots[back] = (self._decode(return_value), received_at)
+            self._prefetch_front = back
+            published = received_at
+
+    def start_prefetch(self, timeout=1.0):
+        """
+        Starts fetching frames in a background thread, so the control loop can compute and actuate while
+        the next frame is on its way. Blocks until the first frame has arrived.
+
+        Args:
+            timeout (float): Maximum time in seconds to wait for the first frame.
+        """
+        if self._prefetch_thread is not None:
+            return
+        self._prefetch_stop.clear()
+        self._prefetch_thread = threading.Thread(target=self._prefetch, name="ColorSensor prefetch", daemon=True)
+        self._prefetch_thread.start()
+        deadline = time.monotonic() + timeout
+        while self.latest_frame()[0] is None and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    def stop_prefetch(self):
+        """Stops the prefetch thread and waits for it to finish its current fetch."""
+        if self._prefetch_thread is None:
+            return
+        self._prefetch_stop.set()
+        self._prefetch_thread.join()
+        self._prefetch_thread = None
+        self._prefetch_slots = [(None, None), (None, None)]
+
+    def latest_frame(self):
+        """
+        Returns:
+            (image, timestamp): The newest complete prefetched frame and the time.monotonic() at which it
+            arrived, or (None, None) if none has arrived yet.
+        """
+        return self._prefetch_slots[self._prefetch_front]
+
+    def image_correction(self, image, res, out=None):
+        """
+        Turns an image coming directly out of CoppeliaSim into a res*res*3 uint8 array, see image_correction.
+        """
+
+        return image_correction(image, res, out)
+
+    def frame_age(self):
+        """
+        Returns:
+            The age in seconds of the newest prefetched or streamed frame, or 0 when reading frames
+            with blocking calls since those are always fresh.
+        """
+        if self._prefetch_thread is not None:
+            frame_time = self.latest_frame()[1]
+            return float('inf') if frame_time is None else time.monotonic() - frame_time
+        if self.subscription is None:
+            return 0.0
+        return self.subscription.age()
+
+    def close(self):
+        """Stops the prefetch thread and streaming the "Sensors" signal, if they were started."""
+        self.stop_prefetch()
+        if self.subscription is not None:
+            self.subscription.unsubscribe()
+
+
 # HELPER FUNCTIONS
 
+def image_correction(image, res, out=None):
+    """
+    This function can be applied to images coming directly out of CoppeliaSim.
+    It turns the 1-dimensional array into a more useful res*res*3 array, with the first
+    two dimensions corresponding to the coordinates of a pixel and the third dimension to the
+    RGB values. Aspect ratio of the image is assumed to be square (1x1).
+
+    The float intensities are scaled, truncated, flipped and written as uint8 in a single pass.
+
+    :param image: the image as a 1D array of floats between 0 and 1, e.g. a float32 array
+    :param res: the resolution of the image, e.g. 64
+    :param out: optional preallocated uint8 array of shape res*res*3 to write the image into
+    :return: a contiguous uint8 array of shape res*res*3
+    """
+
+    flipped = np.asarray(image, dtype=np.float32).reshape((res, res, 3))[::-1]
+    if out is None:
+        out = np.empty((res, res, 3), dtype=np.uint8)
+    elif out.shape != (res, res, 3) or out.dtype != np.uint8:
+        raise ValueError(f"out must be a uint8 array of shape {(res, res, 3)}, got {out.dtype} {out.shape}")
+    # scaled in double precision so the truncation matches int(x * 255) on the unpacked floats
+    np.multiply(flipped, 255, out=out, dtype=np.float64, casting='unsafe')
+    return out
+
 
 def show_image(image):
     plt.imshow(image)
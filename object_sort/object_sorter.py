@@ -8,26 +8,26 @@ import numpy as np
 # Set up simulation - DONT TOUCH THIS                                     #
 ###########################################################################
 
-client = RemoteAPIClient()
-sim = client.require("sim")
-
 # HANDLES FOR ACTUATORS AND SENSORS
-robot = Robot_OS(sim, DeviceNames.ROBOT_OS)
+def setup(sim):
+    """
+    Creates the devices used by the behaviours. sim is the sim object of the ZMQ remote API, or a
+    devices.KinematicTransport to run without CoppeliaSim.
+    """
+    global robot, top_image_sensor, small_image_sensor, left_motor, right_motor
+    robot = Robot_OS(sim, DeviceNames.ROBOT_OS)
 
-top_image_sensor = ImageSensor(sim, DeviceNames.TOP_IMAGE_SENSOR_OS)
-small_image_sensor = ImageSensor(sim, DeviceNames.SMALL_IMAGE_SENSOR_OS)
+    top_image_sensor = ImageSensor(sim, DeviceNames.TOP_IMAGE_SENSOR_OS)
+    small_image_sensor = ImageSensor(sim, DeviceNames.SMALL_IMAGE_SENSOR_OS)
 
-left_motor = Motor(sim, DeviceNames.MOTOR_LEFT_OS, Direction.CLOCKWISE)
-right_motor = Motor(sim, DeviceNames.MOTOR_RIGHT_OS, Direction.CLOCKWISE)
+    left_motor = Motor(sim, DeviceNames.MOTOR_LEFT_OS, Direction.CLOCKWISE)
+    right_motor = Motor(sim, DeviceNames.MOTOR_RIGHT_OS, Direction.CLOCKWISE)
 
 # HELPER FUNCTION
 def show_image(image):
 	plt.imshow(image)
 	plt.show()
 
-# Starts coppeliasim simulation if not done already
-sim.startSimulation()
-
 ###########################################################################
 ## Abstract and concrete classes
 
@@ -470,13 +470,22 @@ def get_behaviours():
     
     return [avoid_walls, battery, find_block, grab_block, compress_block, avoid_walls_with_block, find_red_plant, find_blue_plant, deliver]
 
-## Initialize scheduler with behaviours
-scheduler = Scheduler(get_behaviours())
-
 # MAIN CONTROL LOOP
-t = 0
-while True:
-    t += 1
-    small_image_sensor._update_image()
-    top_image_sensor._update_image()
-    scheduler.run_step(t)
+# guarded so the behaviours and predicates can be imported without a running simulator
+if __name__ == "__main__":
+    client = RemoteAPIClient()
+    sim = client.require("sim")
+    setup(sim)
+
+    # Starts coppeliasim simulation if not done already
+    sim.startSimulation()
+
+    ## Initialize scheduler with behaviours
+    scheduler = Scheduler(get_behaviours())
+
+    t = 0
+    while True:
+        t += 1
+        small_image_sensor._update_image()
+        top_image_sensor._update_image()
+        scheduler.run_step(t)
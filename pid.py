@@ -0,0 +1,144 @@
+import time
+import numpy as np
+
+
+class PID:
+    """
+    PID controller for a stream of errors, one update per control tick.
+
+    The gains are per second: the integral sums error * dt and the derivative is the change of the error
+    divided by dt. dt is either fixed, e.g. the simulation step when running in synchronous mode, or
+    measured between calls to update.
+
+    Attributes:
+        KP, KD, KI (float): The proportional, derivative and integral gain.
+        integral (float): The integral of the error so far, clamped to +-integral_limit.
+        derivative (float): The low-pass filtered derivative of the error at the last update.
+        prev_error (float): The error of the last update, initial_error before the first one.
+    """
+
+    def __init__(self, KP, KD=0.0, KI=0.0, dt=None, integral_limit=None, derivative_tau=0.0, initial_error=None,
+                 clock=time.monotonic):
+        """
+        Args:
+            KP (float): The proportional gain.
+            KD (float): The derivative gain.
+            KI (float): The integral gain.
+            dt (float): The fixed time between updates in seconds, or None to measure it with clock.
+            integral_limit (float): Anti-windup: the integral is kept within +-integral_limit. None disables it.
+            derivative_tau (float): The time constant in seconds of the low-pass filter on the derivative,
+                0 for no filtering.
+            initial_error (float): The previous error assumed at the first update, e.g. 0 so the first derivative
+                is the first error over dt. None leaves the derivative at 0 until there are two errors.
+            clock (callable): The time source used when dt is None.
+        """
+        self.KP = KP
+        self.KD = KD
+        self.KI = KI
+        self.dt = dt
+        self.integral_limit = integral_limit
+        self.derivative_tau = derivative_tau
+        self.initial_error = initial_error
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        """Forgets the integral, the derivative and the previous error."""
+        self.integral = 0.0
+        self.derivative = 0.0
+        self.prev_error = self.initial_error
+        self._prev_time = None
+
+    def _measure_dt(self):
+        now = self.clock()
+        dt = 0.0 if self._prev_time is None else now - self._prev_time
+        self._prev_time = now
+        return dt
+
+    def update(self, error, dt=None):
+        """
+        Args:
+            error (float): The current error.
+            dt (float): The time since the last update; by default the fixed dt or the measured time.
+
+        Returns:
+            float: KP * error + KD * derivative + KI * integral.
+        """
+        if dt is None:
+            dt = self.dt if self.dt is not None else self._measure_dt()
+        self.integral = _clamp(self.integral + error * dt, self.integral_limit)
+        if self.prev_error is not None and dt > 0:
+            raw = (error - self.prev_error) / dt
+            self.derivative += _alpha(dt, self.derivative_tau) * (raw - self.derivative)
+        self.prev_error = error
+        return self.KP * error + self.KD * self.derivative + self.KI * self.integral
+
+    __call__ = update
+
+    @staticmethod
+    def batch(errors, gains, dt, integral_limit=None, derivative_tau=0.0, initial_error=None):
+        """
+        Evaluates many gain sets on a recorded error trace at once, as if a fresh PID with each gain set had
+        been updated with every error in turn. The error, integral and derivative traces do not depend on the
+        gains, so they are computed once and all outputs come from one matrix product.
+
+        Without integral_limit and derivative_tau the traces are NumPy array operations. The clamped integral
+        and the filtered derivative depend on their own previous value, so with either of them that trace is
+        computed by a Python loop over the samples, once for all gain sets.
+
+        Args:
+            errors (np.array): The error trace, shape (samples,).
+            gains (np.array): The gain sets as rows of (KP, KD, KI), shape (sets, 3).
+            dt (float or np.array): The time between updates, a scalar or one value per sample.
+            integral_limit (float): As for PID.
+            derivative_tau (float): As for PID.
+            initial_error (float): As for PID.
+
+        Returns:
+            np.array: The controller outputs, shape (sets, samples).
+        """
+        errors = np.asarray(errors, dtype=np.float64)
+        dt = np.broadcast_to(np.asarray(dt, dtype=np.float64), errors.shape)
+        integral = errors * dt
+        if integral_limit is None:
+            integral = np.cumsum(integral)
+        else:
+            integral = _accumulate(lambda total, value: _clamp(total + value, integral_limit), integral, initial=0.0)
+        raw = np.zeros_like(errors)
+        if len(errors) and initial_error is not None and dt[0] > 0:
+            raw[0] = (errors[0] - initial_error) / dt[0]
+        if len(errors) > 1:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                raw[1:] = np.where(dt[1:] > 0, np.diff(errors) / dt[1:], 0.0)
+        if derivative_tau > 0:
+            alpha = np.where(dt > 0, dt / (derivative_tau + dt), 0.0)
+            derivative = _accumulate(lambda filtered, step: filtered + step[0] * (step[1] - filtered),
+                                     list(zip(alpha, raw)), initial=0.0)
+        else:
+            derivative = raw
+        terms = np.stack([errors, derivative, integral])
+        return np.asarray(gains, dtype=np.float64).reshape(-1, 3) @ terms
+
+
+def _clamp(value, limit):
+    if limit is None:
+        return value
+    return min(max(value, -limit), limit)
+
+
+def _alpha(dt, tau):
+    """The weight of a new sample in a first-order low-pass filter with time constant tau."""
+    return dt / (tau + dt)
+
+
+def _accumulate(function, values, initial=None):
+    """
+    Returns:
+        np.array: The running values of function over values, like itertools.accumulate, as float64.
+    """
+    result = np.empty(len(values))
+    total = initial
+    for i, value in enumerate(values):
+        total = value if total is None else function(total, value)
+        result[i] = total
+    return result
@@ -0,0 +1,205 @@
+"""
+Binary run logs: a header with the metadata of a run, followed by fixed-size records.
+
+A run log starts with the 8 byte magic MAGIC, a little-endian uint32 giving the length of the JSON header and
+the header itself, padded so the records start at a multiple of ALIGNMENT bytes. The header holds the
+record dtype and the metadata of the run, e.g. the gains, base_speed, scene and start time. The records
+follow back to back until the end of the file, so the number of records is given by the file size and a
+log can be read with np.memmap while it is still being written.
+
+Convert between run logs and CSV files like error.csv with
+
+    python runlog.py error.csv error.run
+    python runlog.py error.run error.csv
+"""
+import csv
+import json
+import os
+import struct
+import sys
+import time
+import numpy as np
+from telemetry import TelemetryWriter
+
+MAGIC = b'RUNLOG\x00\x01'
+ALIGNMENT = 64
+
+
+def write_header(file, dtype, metadata):
+    """
+    Writes the header of a run log.
+
+    Args:
+        file: A binary file opened for writing, positioned at its start.
+        dtype (np.dtype): The dtype of the records.
+        metadata (dict): JSON serialisable metadata of the run.
+
+    Returns:
+        int: The offset of the first record.
+
+    Raises:
+        ValueError: If the records have no fields, so their number could not be told from the file size.
+    """
+    if np.dtype(dtype).itemsize == 0:
+        raise ValueError("Run log records need at least one field")
+    header = json.dumps({'dtype': np.dtype(dtype).descr, 'metadata': metadata}).encode()
+    offset = len(MAGIC) + 4 + len(header)
+    header += b' ' * (-offset % ALIGNMENT)
+    file.write(MAGIC + struct.pack('<I', len(header)) + header)
+    return offset + (-offset % ALIGNMENT)
+
+
+def read_header(path):
+    """
+    Returns:
+        (dict, np.dtype, int): The metadata of the run, the dtype of its records and the offset of the first one.
+
+    Raises:
+        ValueError: If the file is not a run log or its records have no fields.
+    """
+    with open(path, 'rb') as file:
+        start = file.read(len(MAGIC) + 4)
+        if len(start) < len(MAGIC) + 4 or start[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a run log")
+        length, = struct.unpack('<I', start[len(MAGIC):])
+        header = json.loads(file.read(length))
+    dtype = np.dtype([tuple(field) for field in header['dtype']])
+    if dtype.itemsize == 0:
+        raise ValueError(f"{path} has records without fields")
+    return header['metadata'], dtype, len(MAGIC) + 4 + length
+
+
+def read_run(path, mode='r'):
+    """
+    Opens a run log without reading its records.
+
+    Args:
+        path (str): The run log.
+        mode (str): The np.memmap mode, 'r+' to modify the records in place.
+
+    Returns:
+        (dict, np.ndarray): The metadata and a structured array mapping all complete records in the file.
+    """
+    metadata, dtype, offset = read_header(path)
+    count = (os.path.getsize(path) - offset) // dtype.itemsize
+    if count == 0:
+        # np.memmap cannot map zero bytes
+        return metadata, np.empty(0, dtype)
+    return metadata, np.memmap(path, dtype, mode, offset, shape=(count,))
+
+
+class RunLogWriter(TelemetryWriter):
+    """
+    Appends records to a run log, buffered and written in the background like TelemetryWriter.
+
+    Attributes:
+        dtype (np.dtype): The dtype of the records; append receives one value per field.
+        metadata (dict): The metadata written to the header.
+    """
+
+    def __init__(self, path, dtype, metadata=None, **kwargs):
+        """
+        Args:
+            path (str): The file to write, e.g. 'error.run'.
+            dtype: The dtype of the records, e.g. [('time', '<f4'), ('error', '<f4')].
+            metadata (dict): The metadata of the run; start_time is added unless given.
+            **kwargs: Passed on to TelemetryWriter.
+        """
+        self.dtype = np.dtype(dtype)
+        self.metadata = {'start_time': time.time(), **(metadata or {})}
+        super().__init__(path, self.dtype.names, **kwargs)
+
+    def _open(self, append):
+        if append and os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            self.metadata, dtype, offset = read_header(self.path)
+            if dtype != self.dtype:
+                raise ValueError(f"{self.path} holds records of {dtype}, not {self.dtype}")
+            self._file = open(self.path, 'ab')
+            # drop a record that was cut off when the last run was killed
+            self._file.truncate(offset + (os.path.getsize(self.path) - offset) // dtype.itemsize * dtype.itemsize)
+        else:
+            self._file = open(self.path, 'wb')
+            write_header(self._file, self.dtype, self.metadata)
+            self._file.flush()
+
+    def _write(self, columns):
+        records = np.empty(columns.shape[1], self.dtype)
+        for name, column in zip(self.dtype.names, columns):
+            records[name] = column
+        self._file.write(records.tobytes())
+        self._file.flush()
+
+
+def csv_to_run(csv_path, run_path, dtype='<f4', metadata=None):
+    """
+    Converts a CSV file like error.csv into a run log. Columns holding the same value in every row, like the
+    gains, become metadata; the others become the fields of the records. The error column, or the first
+    column if there is none, always stays a field, even if it is constant or there is only one row.
+
+    Args:
+        csv_path (str): The CSV file with a header row.
+        run_path (str): The run log to write.
+        dtype (str): The dtype of every record field.
+        metadata (dict): Further metadata of the run.
+
+    Returns:
+        int: The number of records written.
+    """
+    with open(csv_path, newline='') as file:
+        rows = csv.reader(file)
+        names = next(rows)
+        values = np.array([[float(value) for value in row] for row in rows if row], dtype=np.float64)
+    values = values.reshape(-1, len(names))
+    metadata = dict(metadata or {})
+    kept = names.index('error') if 'error' in names else 0
+    fields = []
+    for i, name in enumerate(names):
+        if i != kept and len(values) and np.all(values[:, i] == values[0, i]):
+            metadata[name] = values[0, i].item()
+        else:
+            fields.append(i)
+    records = np.empty(len(values), [(names[i], dtype) for i in fields])
+    for i in fields:
+        records[names[i]] = values[:, i]
+    with open(run_path, 'wb') as file:
+        write_header(file, records.dtype, metadata)
+        file.write(records.tobytes())
+    return len(records)
+
+
+def run_to_csv(run_path, csv_path, metadata_columns=None):
+    """
+    Converts a run log into a CSV file, repeating metadata on every row the way error.csv does.
+
+    Args:
+        run_path (str): The run log.
+        csv_path (str): The CSV file to write.
+        metadata_columns (list): The metadata entries to add as columns; by default all numeric entries
+            except start_time.
+
+    Returns:
+        int: The number of rows written.
+    """
+    metadata, records = read_run(run_path)
+    if metadata_columns is None:
+        metadata_columns = [key for key, value in metadata.items()
+                            if key != 'start_time' and isinstance(value, (int, float))]
+    constants = [str(metadata[key]) for key in metadata_columns]
+    with open(csv_path, 'w') as file:
+        file.write(','.join(list(records.dtype.names) + list(metadata_columns)) + '\n')
+        # str of a NumPy scalar is the shortest text that reads back to the same value in its own precision
+        columns = [records[name] for name in records.dtype.names]
+        for row in zip(*columns):
+            file.write(','.join([str(value) for value in row] + constants) + '\n')
+    return len(records)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python runlog.py SOURCE DESTINATION, converting error.csv <-> error.run")
+        sys.exit(2)
+    source, destination = sys.argv[1:]
+    if source.endswith('.csv'):
+        print(f"{csv_to_run(source, destination)} records written to {destination}")
+    else:
+        print(f"{run_to_csv(source, destination)} rows written to {destination}")
@@ -3,143 +3,165 @@ import struct
 import sys
 import os
 import ctypes as ct
+import numpy as np
 from simConst import *
 
 #load library
 libsimx = None
-try:
-    file_extension = '.so'
-    if platform.system() =='cli':
-        file_extension = '.dll'
-    elif platform.system() =='Windows':
-        file_extension = '.dll'
-    elif platform.system() == 'Darwin':
-        file_extension = '.dylib'
-    else:
+
+def _loadLibrary():
+    '''
+    Loads the remoteApi library the first time a prototype is called, so that importing this module stays cheap
+    '''
+    global libsimx
+    if libsimx is None:
         file_extension = '.so'
-    libfullpath = os.path.join(os.path.dirname(__file__), 'remoteApi' + file_extension)
-    libsimx = ct.CDLL(libfullpath)
-except:
-    print ('----------------------------------------------------')
-    print ('The remoteApi library could not be loaded. Make sure')
-    print ('it is located in the same folder as "sim.py", or')
-    print ('appropriately adjust the file "sim.py"')
-    print ('----------------------------------------------------')
-    print ('')
+        if platform.system() =='cli':
+            file_extension = '.dll'
+        elif platform.system() =='Windows':
+            file_extension = '.dll'
+        elif platform.system() == 'Darwin':
+            file_extension = '.dylib'
+        else:
+            file_extension = '.so'
+        libfullpath = os.path.join(os.path.dirname(__file__), 'remoteApi' + file_extension)
+        try:
+            libsimx = ct.CDLL(libfullpath)
+        except OSError as e:
+            raise RuntimeError('The remoteApi library could not be loaded from "%s" (%s). Make sure it is located '
+                               'in the same folder as "sim.py", or appropriately adjust the file "sim.py"' % (libfullpath, e))
+    return libsimx
+
+class _LazyPrototype(object):
+    '''
+    ctypes function prototype that is bound to the remoteApi library on its first call and cached afterwards
+    '''
+    __slots__ = ('name', 'restype', 'argtypes', 'function')
+
+    def __init__(self, name, restype, *argtypes):
+        self.name = name
+        self.restype = restype
+        self.argtypes = argtypes
+        self.function = None
+
+    def __call__(self, *args):
+        if self.function is None:
+            self.function = ct.CFUNCTYPE(self.restype, *self.argtypes)((self.name, _loadLibrary()))
+        return self.function(*args)
 
 #ctypes wrapper prototypes
-c_GetJointPosition          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetJointPosition", libsimx))
-c_SetJointPosition          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointPosition", libsimx))
-c_GetJointMatrix            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetJointMatrix", libsimx))
-c_SetSphericalJointMatrix   = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetSphericalJointMatrix", libsimx))
-c_SetJointTargetVelocity    = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointTargetVelocity", libsimx))
-c_SetJointTargetPosition    = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointTargetPosition", libsimx))
-c_GetJointForce             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetJointForce", libsimx))
-c_GetJointMaxForce          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetJointMaxForce", libsimx))
-c_SetJointForce             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointMaxForce", libsimx))
-c_SetJointMaxForce          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointMaxForce", libsimx))
-c_ReadForceSensor           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32)(("simxReadForceSensor", libsimx))
-c_BreakForceSensor          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxBreakForceSensor", libsimx))
-c_ReadVisionSensor          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)(("simxReadVisionSensor", libsimx))
-c_GetObjectHandle           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectHandle", libsimx))
-c_GetVisionSensorImage      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_byte)), ct.c_ubyte, ct.c_int32)(("simxGetVisionSensorImage", libsimx))
-c_SetVisionSensorImage      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_byte), ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxSetVisionSensorImage", libsimx))
-c_GetVisionSensorDepthBuffer= ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.c_int32)(("simxGetVisionSensorDepthBuffer", libsimx))
-c_GetObjectChild            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectChild", libsimx))
-c_GetObjectParent           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectParent", libsimx))
-c_ReadProximitySensor       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.c_int32)(("simxReadProximitySensor", libsimx))
-c_LoadModel                 = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.c_int32)(("simxLoadModel", libsimx))
-c_LoadUI                    = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)(("simxLoadUI", libsimx))
-c_LoadScene                 =  ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.c_int32)(("simxLoadScene", libsimx))
-c_StartSimulation           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxStartSimulation", libsimx))
-c_PauseSimulation           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxPauseSimulation", libsimx))
-c_StopSimulation            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxStopSimulation", libsimx))
-c_GetUIHandle               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUIHandle", libsimx))
-c_GetUISlider               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUISlider", libsimx))
-c_SetUISlider               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetUISlider", libsimx))
-c_GetUIEventButton          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUIEventButton", libsimx))
-c_GetUIButtonProperty       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUIButtonProperty", libsimx))
-c_SetUIButtonProperty       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetUIButtonProperty", libsimx))
-c_AddStatusbarMessage       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxAddStatusbarMessage", libsimx))
-c_AuxiliaryConsoleOpen      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.c_int32)(("simxAuxiliaryConsoleOpen", libsimx))
-c_AuxiliaryConsoleClose     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxAuxiliaryConsoleClose", libsimx))
-c_AuxiliaryConsolePrint     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxAuxiliaryConsolePrint", libsimx))
-c_AuxiliaryConsoleShow      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxAuxiliaryConsoleShow", libsimx))
-c_GetObjectOrientation      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectOrientation", libsimx))
-c_GetObjectQuaternion       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectQuaternion", libsimx))
-c_GetObjectPosition         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectPosition", libsimx))
-c_SetObjectOrientation      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetObjectOrientation", libsimx))
-c_SetObjectQuaternion       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetObjectQuaternion", libsimx))
-c_SetObjectPosition         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetObjectPosition", libsimx))
-c_SetObjectParent           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxSetObjectParent", libsimx))
-c_SetUIButtonLabel          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32)(("simxSetUIButtonLabel", libsimx))
-c_GetLastErrors             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetLastErrors", libsimx))
-c_GetArrayParam             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetArrayParam", libsimx))
-c_SetArrayParam             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetArrayParam", libsimx))
-c_GetBoolParam              = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)(("simxGetBoolParam", libsimx))
-c_SetBoolParam              = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxSetBoolParam", libsimx))
-c_GetInt32Param             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetInt32Param", libsimx))
-c_SetInt32Param             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetInt32Param", libsimx))
-c_GetFloatParam             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetFloatParam", libsimx))
-c_SetFloatParam             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetFloatParam", libsimx))
-c_GetStringParam            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetStringParam", libsimx))
-c_GetCollisionHandle        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetCollisionHandle", libsimx))
-c_GetDistanceHandle         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetDistanceHandle", libsimx))
-c_GetCollectionHandle       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetCollectionHandle", libsimx))
-c_ReadCollision             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)(("simxReadCollision", libsimx))
-c_ReadDistance              = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxReadDistance", libsimx))
-c_CheckCollision            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)(("simxCheckCollision", libsimx))
-c_CheckDistance             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxCheckDistance", libsimx))
-c_RemoveObject              = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxRemoveObject", libsimx))
-c_RemoveModel               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxRemoveModel", libsimx))
-c_RemoveUI                  = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxRemoveUI", libsimx))
-c_CloseScene                = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxCloseScene", libsimx))
-c_GetObjects                = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)(("simxGetObjects", libsimx))
-c_DisplayDialog             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32)(("simxDisplayDialog", libsimx))
-c_EndDialog                 = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxEndDialog", libsimx))
-c_GetDialogInput            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetDialogInput", libsimx))
-c_GetDialogResult           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetDialogResult", libsimx))
-c_CopyPasteObjects          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxCopyPasteObjects", libsimx))
-c_GetObjectSelection        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectSelection", libsimx))
-c_SetObjectSelection        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.c_int32)(("simxSetObjectSelection", libsimx))
-c_ClearFloatSignal          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxClearFloatSignal", libsimx))
-c_ClearInt32Signal          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxClearInt32Signal", libsimx))
-c_ClearStringSignal         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxClearStringSignal", libsimx))
-c_GetFloatSignal            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.c_int32)(("simxGetFloatSignal", libsimx))
-c_GetInt32Signal            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetInt32Signal", libsimx))
-c_GetStringSignal           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetStringSignal", libsimx))
-c_SetFloatSignal            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_float, ct.c_int32)(("simxSetFloatSignal", libsimx))
-c_SetInt32Signal            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32)(("simxSetInt32Signal", libsimx))
-c_SetStringSignal           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)(("simxSetStringSignal", libsimx))
-c_AppendStringSignal        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)(("simxAppendStringSignal", libsimx))
-c_WriteStringStream         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)(("simxWriteStringStream", libsimx))
-c_GetObjectFloatParam       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectFloatParam", libsimx))
-c_SetObjectFloatParam       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetObjectFloatParam", libsimx))
-c_GetObjectInt32Param       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectInt32Param", libsimx))
-c_SetObjectInt32Param       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetObjectInt32Param", libsimx))
-c_GetModelProperty          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetModelProperty", libsimx))
-c_SetModelProperty          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetModelProperty", libsimx))
-c_Start                     = ct.CFUNCTYPE(ct.c_int32,ct.POINTER(ct.c_char), ct.c_int32, ct.c_ubyte, ct.c_ubyte, ct.c_int32, ct.c_int32)(("simxStart", libsimx))
-c_Finish                    = ct.CFUNCTYPE(None, ct.c_int32)(("simxFinish", libsimx))
-c_GetPingTime               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32))(("simxGetPingTime", libsimx))
-c_GetLastCmdTime            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32)(("simxGetLastCmdTime", libsimx))
-c_SynchronousTrigger        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32)(("simxSynchronousTrigger", libsimx))
-c_Synchronous               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_ubyte)(("simxSynchronous", libsimx))
-c_PauseCommunication        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_ubyte)(("simxPauseCommunication", libsimx))
-c_GetInMessageInfo          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))(("simxGetInMessageInfo", libsimx))
-c_GetOutMessageInfo         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))(("simxGetOutMessageInfo", libsimx))
-c_GetConnectionId           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32)(("simxGetConnectionId", libsimx))
-c_CreateBuffer              = ct.CFUNCTYPE(ct.POINTER(ct.c_ubyte), ct.c_int32)(("simxCreateBuffer", libsimx))
-c_ReleaseBuffer             = ct.CFUNCTYPE(None, ct.c_void_p)(("simxReleaseBuffer", libsimx))
-c_TransferFile              = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32)(("simxTransferFile", libsimx))
-c_EraseFile                 = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxEraseFile", libsimx))
-c_GetAndClearStringSignal   = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetAndClearStringSignal", libsimx))
-c_ReadStringStream          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxReadStringStream", libsimx))
-c_CreateDummy               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_float, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_int32), ct.c_int32)(("simxCreateDummy", libsimx))
-c_Query                     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxQuery", libsimx))
-c_GetObjectGroupData        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetObjectGroupData", libsimx))
-c_GetObjectVelocity         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectVelocity", libsimx))
-c_CallScriptFunction        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_int32),ct.c_int32,ct.POINTER(ct.c_float),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_ubyte),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_ubyte)),ct.c_int32)(("simxCallScriptFunction", libsimx))
+c_GetJointPosition          = _LazyPrototype("simxGetJointPosition", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetJointPosition          = _LazyPrototype("simxSetJointPosition", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_GetJointMatrix            = _LazyPrototype("simxGetJointMatrix", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetSphericalJointMatrix   = _LazyPrototype("simxSetSphericalJointMatrix", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetJointTargetVelocity    = _LazyPrototype("simxSetJointTargetVelocity", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_SetJointTargetPosition    = _LazyPrototype("simxSetJointTargetPosition", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_GetJointForce             = _LazyPrototype("simxGetJointForce", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_GetJointMaxForce          = _LazyPrototype("simxGetJointMaxForce", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetJointForce             = _LazyPrototype("simxSetJointMaxForce", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_SetJointMaxForce          = _LazyPrototype("simxSetJointMaxForce", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_ReadForceSensor           = _LazyPrototype("simxReadForceSensor", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32)
+c_BreakForceSensor          = _LazyPrototype("simxBreakForceSensor", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_ReadVisionSensor          = _LazyPrototype("simxReadVisionSensor", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)
+c_GetObjectHandle           = _LazyPrototype("simxGetObjectHandle", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetVisionSensorImage      = _LazyPrototype("simxGetVisionSensorImage", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_byte)), ct.c_ubyte, ct.c_int32)
+c_SetVisionSensorImage      = _LazyPrototype("simxSetVisionSensorImage", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_byte), ct.c_int32, ct.c_ubyte, ct.c_int32)
+c_GetVisionSensorDepthBuffer= _LazyPrototype("simxGetVisionSensorDepthBuffer", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.c_int32)
+c_GetObjectChild            = _LazyPrototype("simxGetObjectChild", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetObjectParent           = _LazyPrototype("simxGetObjectParent", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_ReadProximitySensor       = _LazyPrototype("simxReadProximitySensor", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.c_int32)
+c_LoadModel                 = _LazyPrototype("simxLoadModel", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.c_int32)
+c_LoadUI                    = _LazyPrototype("simxLoadUI", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)
+c_LoadScene                 = _LazyPrototype("simxLoadScene", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.c_int32)
+c_StartSimulation           = _LazyPrototype("simxStartSimulation", ct.c_int32, ct.c_int32, ct.c_int32)
+c_PauseSimulation           = _LazyPrototype("simxPauseSimulation", ct.c_int32, ct.c_int32, ct.c_int32)
+c_StopSimulation            = _LazyPrototype("simxStopSimulation", ct.c_int32, ct.c_int32, ct.c_int32)
+c_GetUIHandle               = _LazyPrototype("simxGetUIHandle", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetUISlider               = _LazyPrototype("simxGetUISlider", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetUISlider               = _LazyPrototype("simxSetUISlider", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_GetUIEventButton          = _LazyPrototype("simxGetUIEventButton", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetUIButtonProperty       = _LazyPrototype("simxGetUIButtonProperty", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetUIButtonProperty       = _LazyPrototype("simxSetUIButtonProperty", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_AddStatusbarMessage       = _LazyPrototype("simxAddStatusbarMessage", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_AuxiliaryConsoleOpen      = _LazyPrototype("simxAuxiliaryConsoleOpen", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.c_int32)
+c_AuxiliaryConsoleClose     = _LazyPrototype("simxAuxiliaryConsoleClose", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_AuxiliaryConsolePrint     = _LazyPrototype("simxAuxiliaryConsolePrint", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_AuxiliaryConsoleShow      = _LazyPrototype("simxAuxiliaryConsoleShow", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)
+c_GetObjectOrientation      = _LazyPrototype("simxGetObjectOrientation", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_GetObjectQuaternion       = _LazyPrototype("simxGetObjectQuaternion", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_GetObjectPosition         = _LazyPrototype("simxGetObjectPosition", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetObjectOrientation      = _LazyPrototype("simxSetObjectOrientation", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetObjectQuaternion       = _LazyPrototype("simxSetObjectQuaternion", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetObjectPosition         = _LazyPrototype("simxSetObjectPosition", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetObjectParent           = _LazyPrototype("simxSetObjectParent", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)
+c_SetUIButtonLabel          = _LazyPrototype("simxSetUIButtonLabel", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32)
+c_GetLastErrors             = _LazyPrototype("simxGetLastErrors", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)
+c_GetArrayParam             = _LazyPrototype("simxGetArrayParam", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetArrayParam             = _LazyPrototype("simxSetArrayParam", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_GetBoolParam              = _LazyPrototype("simxGetBoolParam", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)
+c_SetBoolParam              = _LazyPrototype("simxSetBoolParam", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)
+c_GetInt32Param             = _LazyPrototype("simxGetInt32Param", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetInt32Param             = _LazyPrototype("simxSetInt32Param", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_GetFloatParam             = _LazyPrototype("simxGetFloatParam", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetFloatParam             = _LazyPrototype("simxSetFloatParam", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_GetStringParam            = _LazyPrototype("simxGetStringParam", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)
+c_GetCollisionHandle        = _LazyPrototype("simxGetCollisionHandle", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetDistanceHandle         = _LazyPrototype("simxGetDistanceHandle", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetCollectionHandle       = _LazyPrototype("simxGetCollectionHandle", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_ReadCollision             = _LazyPrototype("simxReadCollision", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)
+c_ReadDistance              = _LazyPrototype("simxReadDistance", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_CheckCollision            = _LazyPrototype("simxCheckCollision", ct.c_int32, ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)
+c_CheckDistance             = _LazyPrototype("simxCheckDistance", ct.c_int32, ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_RemoveObject              = _LazyPrototype("simxRemoveObject", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_RemoveModel               = _LazyPrototype("simxRemoveModel", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_RemoveUI                  = _LazyPrototype("simxRemoveUI", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_CloseScene                = _LazyPrototype("simxCloseScene", ct.c_int32, ct.c_int32, ct.c_int32)
+c_GetObjects                = _LazyPrototype("simxGetObjects", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)
+c_DisplayDialog             = _LazyPrototype("simxDisplayDialog", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32)
+c_EndDialog                 = _LazyPrototype("simxEndDialog", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_GetDialogInput            = _LazyPrototype("simxGetDialogInput", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)
+c_GetDialogResult           = _LazyPrototype("simxGetDialogResult", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_CopyPasteObjects          = _LazyPrototype("simxCopyPasteObjects", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetObjectSelection        = _LazyPrototype("simxGetObjectSelection", ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetObjectSelection        = _LazyPrototype("simxSetObjectSelection", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.c_int32)
+c_ClearFloatSignal          = _LazyPrototype("simxClearFloatSignal", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_ClearInt32Signal          = _LazyPrototype("simxClearInt32Signal", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_ClearStringSignal         = _LazyPrototype("simxClearStringSignal", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_GetFloatSignal            = _LazyPrototype("simxGetFloatSignal", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.c_int32)
+c_GetInt32Signal            = _LazyPrototype("simxGetInt32Signal", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetStringSignal           = _LazyPrototype("simxGetStringSignal", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetFloatSignal            = _LazyPrototype("simxSetFloatSignal", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_float, ct.c_int32)
+c_SetInt32Signal            = _LazyPrototype("simxSetInt32Signal", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32)
+c_SetStringSignal           = _LazyPrototype("simxSetStringSignal", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)
+c_AppendStringSignal        = _LazyPrototype("simxAppendStringSignal", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)
+c_WriteStringStream         = _LazyPrototype("simxWriteStringStream", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)
+c_GetObjectFloatParam       = _LazyPrototype("simxGetObjectFloatParam", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetObjectFloatParam       = _LazyPrototype("simxSetObjectFloatParam", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_GetObjectInt32Param       = _LazyPrototype("simxGetObjectInt32Param", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetObjectInt32Param       = _LazyPrototype("simxSetObjectInt32Param", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_GetModelProperty          = _LazyPrototype("simxGetModelProperty", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetModelProperty          = _LazyPrototype("simxSetModelProperty", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_Start                     = _LazyPrototype("simxStart", ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_ubyte, ct.c_ubyte, ct.c_int32, ct.c_int32)
+c_Finish                    = _LazyPrototype("simxFinish", None, ct.c_int32)
+c_GetPingTime               = _LazyPrototype("simxGetPingTime", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))
+c_GetLastCmdTime            = _LazyPrototype("simxGetLastCmdTime", ct.c_int32, ct.c_int32)
+c_SynchronousTrigger        = _LazyPrototype("simxSynchronousTrigger", ct.c_int32, ct.c_int32)
+c_Synchronous               = _LazyPrototype("simxSynchronous", ct.c_int32, ct.c_int32, ct.c_ubyte)
+c_PauseCommunication        = _LazyPrototype("simxPauseCommunication", ct.c_int32, ct.c_int32, ct.c_ubyte)
+c_GetInMessageInfo          = _LazyPrototype("simxGetInMessageInfo", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))
+c_GetOutMessageInfo         = _LazyPrototype("simxGetOutMessageInfo", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))
+c_GetConnectionId           = _LazyPrototype("simxGetConnectionId", ct.c_int32, ct.c_int32)
+c_CreateBuffer              = _LazyPrototype("simxCreateBuffer", ct.POINTER(ct.c_ubyte), ct.c_int32)
+c_ReleaseBuffer             = _LazyPrototype("simxReleaseBuffer", None, ct.c_void_p)
+c_TransferFile              = _LazyPrototype("simxTransferFile", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32)
+c_EraseFile                 = _LazyPrototype("simxEraseFile", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_GetAndClearStringSignal   = _LazyPrototype("simxGetAndClearStringSignal", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_ReadStringStream          = _LazyPrototype("simxReadStringStream", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_CreateDummy               = _LazyPrototype("simxCreateDummy", ct.c_int32, ct.c_int32, ct.c_float, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_int32), ct.c_int32)
+c_Query                     = _LazyPrototype("simxQuery", ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetObjectGroupData        = _LazyPrototype("simxGetObjectGroupData", ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)
+c_GetObjectVelocity         = _LazyPrototype("simxGetObjectVelocity", ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32)
+c_CallScriptFunction        = _LazyPrototype("simxCallScriptFunction", ct.c_int32, ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_int32),ct.c_int32,ct.POINTER(ct.c_float),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_ubyte),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_ubyte)),ct.c_int32)
 
 #API functions
 def simxGetJointPosition(clientID, jointHandle, operationMode):
@@ -279,21 +301,33 @@ def simxGetObjectHandle(clientID, objectName, operationMode):
         objectName=objectName.encode('utf-8')
     return c_GetObjectHandle(clientID, objectName, ct.byref(handle), operationMode), handle.value
 
-def simxGetVisionSensorImage(clientID, sensorHandle, options, operationMode):
+def simxGetVisionSensorImage(clientID, sensorHandle, options, operationMode, asArray=False):
     '''
     Please have a look at the function description/documentation in the CoppeliaSim user manual
+
+    With asArray=True the image is returned as a uint8 ndarray of shape (resY, resX, 3), or
+    (resY, resX) for grayscale images, built with a single bulk copy of the C buffer.
     '''
 
     resolution = (ct.c_int*2)()
     c_image  = ct.POINTER(ct.c_byte)()
     bytesPerPixel = 3
-    if (options and 1) != 0:
+    if (options & 1) != 0:
         bytesPerPixel = 1
     ret = c_GetVisionSensorImage(clientID, sensorHandle, resolution, ct.byref(c_image), options, operationMode)
 
     reso = []
     image = []
-    if (ret == 0):
+    if (ret == 0) and asArray:
+        shape = (resolution[1], resolution[0], 3)
+        if bytesPerPixel == 1:
+            shape = (resolution[1], resolution[0])
+        # reading the signed bytes through an unsigned pointer maps them to 0..255 without any arithmetic.
+        # The C buffer belongs to the remote API library and is reused on the next call, hence the copy
+        c_ubytes = ct.cast(c_image, ct.POINTER(ct.c_ubyte))
+        image = np.ctypeslib.as_array(c_ubytes, shape=shape).copy()
+        reso = [resolution[0], resolution[1]]
+    elif (ret == 0):
         image = [None]*resolution[0]*resolution[1]*bytesPerPixel
         for i in range(resolution[0] * resolution[1] * bytesPerPixel):
             image[i] = c_image[i]
@@ -309,16 +343,31 @@ def simxSetVisionSensorImage(clientID, sensorHandle, image, options, operationMo
     image_bytes  = (ct.c_byte*size)(*image)
     return c_SetVisionSensorImage(clientID, sensorHandle, image_bytes, size, options, operationMode)
 
-def simxGetVisionSensorDepthBuffer(clientID, sensorHandle, operationMode):
+def simxGetVisionSensorDepthBuffer(clientID, sensorHandle, operationMode, asArray=False, out=None):
     '''
     Please have a look at the function description/documentation in the CoppeliaSim user manual
+
+    With asArray=True the depth buffer is returned as a float32 ndarray of shape (resY, resX), built
+    with a single bulk copy of the C buffer. Passing a preallocated float32 array as out implies
+    asArray=True and fills that array instead of allocating a new one.
     '''
     c_buffer  = ct.POINTER(ct.c_float)()
     resolution = (ct.c_int*2)()
     ret = c_GetVisionSensorDepthBuffer(clientID, sensorHandle, resolution, ct.byref(c_buffer), operationMode)
     reso = []
     buffer = []
-    if (ret == 0):
+    if (ret == 0) and (asArray or out is not None):
+        # the C buffer belongs to the remote API library and is reused on the next call, hence the copy
+        depth = np.ctypeslib.as_array(c_buffer, shape=(resolution[1], resolution[0]))
+        if out is None:
+            buffer = depth.copy()
+        else:
+            if out.shape != depth.shape or out.dtype != np.float32:
+                raise ValueError('out must be a float32 array of shape %s, got %s %s' % (depth.shape, out.dtype, out.shape))
+            np.copyto(out, depth)
+            buffer = out
+        reso = [resolution[0], resolution[1]]
+    elif (ret == 0):
         buffer = [None]*resolution[0]*resolution[1]
         for i in range(resolution[0] * resolution[1]):
             buffer[i] = c_buffer[i]
@@ -1007,9 +1056,33 @@ def simxGetInt32Signal(clientID, signalName, operationMode):
         signalName=signalName.encode('utf-8')
     return c_GetInt32Signal(clientID, signalName, ct.byref(signalValue), operationMode), signalValue.value
 
-def simxGetStringSignal(clientID, signalName, operationMode):
+def _copySignalValue(signalValue, signalLength, asBytes, out):
+    '''
+    Copies a string signal out of the C buffer in one memmove. Returns a bytearray by default,
+    bytes with asBytes=True, or a memoryview over the caller-supplied writable buffer out.
+    '''
+    if out is not None:
+        view = memoryview(out).cast('B')
+        if signalLength > len(view):
+            raise ValueError('out holds %d bytes but the signal has %d' % (len(view), signalLength))
+        if signalLength > 0:
+            ct.memmove((ct.c_ubyte*len(view)).from_buffer(view), signalValue, signalLength)
+        return view[:signalLength]
+    if asBytes:
+        return ct.string_at(signalValue, signalLength)
+    a = bytearray(signalLength)
+    if signalLength > 0:
+        ct.memmove((ct.c_ubyte*signalLength).from_buffer(a), signalValue, signalLength)
+    if sys.version_info[0] != 3:
+        a=str(a)
+    return a
+
+def simxGetStringSignal(clientID, signalName, operationMode, asBytes=False, out=None):
     '''
     Please have a look at the function description/documentation in the CoppeliaSim user manual
+
+    The value is a bytearray by default, bytes with asBytes=True, or a memoryview over out when a
+    reusable writable buffer is passed.
     '''
 
     signalLength = ct.c_int();
@@ -1018,18 +1091,16 @@ def simxGetStringSignal(clientID, signalName, operationMode):
         signalName=signalName.encode('utf-8')
     ret = c_GetStringSignal(clientID, signalName, ct.byref(signalValue), ct.byref(signalLength), operationMode)
 
-    a = bytearray()
-    if ret == 0:
-        for i in range(signalLength.value):
-            a.append(signalValue[i])
-    if sys.version_info[0] != 3:
-        a=str(a)
-
-    return ret, a
+    if ret != 0:
+        signalLength.value = 0
+    return ret, _copySignalValue(signalValue, signalLength.value, asBytes, out)
 
-def simxGetAndClearStringSignal(clientID, signalName, operationMode):
+def simxGetAndClearStringSignal(clientID, signalName, operationMode, asBytes=False, out=None):
     '''
     Please have a look at the function description/documentation in the CoppeliaSim user manual
+
+    The value is a bytearray by default, bytes with asBytes=True, or a memoryview over out when a
+    reusable writable buffer is passed.
     '''
 
     signalLength = ct.c_int();
@@ -1038,18 +1109,16 @@ def simxGetAndClearStringSignal(clientID, signalName, operationMode):
         signalName=signalName.encode('utf-8')
     ret = c_GetAndClearStringSignal(clientID, signalName, ct.byref(signalValue), ct.byref(signalLength), operationMode)
 
-    a = bytearray()
-    if ret == 0:
-        for i in range(signalLength.value):
-            a.append(signalValue[i])
-    if sys.version_info[0] != 3:
-        a=str(a)
-
-    return ret, a
+    if ret != 0:
+        signalLength.value = 0
+    return ret, _copySignalValue(signalValue, signalLength.value, asBytes, out)
 
-def simxReadStringStream(clientID, signalName, operationMode):
+def simxReadStringStream(clientID, signalName, operationMode, asBytes=False, out=None):
     '''
     Please have a look at the function description/documentation in the CoppeliaSim user manual
+
+    The value is a bytearray by default, bytes with asBytes=True, or a memoryview over out when a
+    reusable writable buffer is passed.
     '''
 
     signalLength = ct.c_int();
@@ -1058,14 +1127,9 @@ def simxReadStringStream(clientID, signalName, operationMode):
         signalName=signalName.encode('utf-8')
     ret = c_ReadStringStream(clientID, signalName, ct.byref(signalValue), ct.byref(signalLength), operationMode)
 
-    a = bytearray()
-    if ret == 0:
-        for i in range(signalLength.value):
-            a.append(signalValue[i])
-    if sys.version_info[0] != 3:
-        a=str(a)
-
-    return ret, a
+    if ret != 0:
+        signalLength.value = 0
+    return ret, _copySignalValue(signalValue, signalLength.value, asBytes, out)
 
 def simxSetFloatSignal(clientID, signalName, signalValue, operationMode):
     '''
@@ -1358,18 +1422,39 @@ def simxQuery(clientID, signalName, signalValue, retSignalName, timeOutInMs):
 
     ret = c_Query(clientID, signalName, sigV, len(signalValue), retSignalName, ct.byref(retSignalValue), ct.byref(retSignalLength), timeOutInMs)
 
-    a = bytearray()
-    if ret == 0:
-        for i in range(retSignalLength.value):
-            a.append(retSignalValue[i])
-    if sys.version_info[0] != 3:
-        a=str(a)
+    if ret != 0:
+        retSignalLength.value = 0
+    return ret, _copySignalValue(retSignalValue, retSignalLength.value, False, None)
 
-    return ret, a
+def _splitStringBlock(stringDataP, stringDataC):
+    '''
+    Splits a block of stringDataC NUL-terminated strings in one pass, with one C-level strlen per string
+    '''
+    strings = []
+    address = ct.cast(stringDataP, ct.c_void_p).value
+    for i in range(stringDataC):
+        a = ct.string_at(address)
+        address += len(a) + 1 #skip null
+        if sys.version_info[0] == 3:
+            a=str(a,'utf-8')
+        strings.append(a)
+    return strings
+
+def _groupDataArray(pointer, count, dtype, objectCount):
+    '''
+    Copies count values from pointer into an ndarray with one row per object whenever the values split evenly
+    '''
+    values = np.ctypeslib.as_array(pointer, shape=(count,)).astype(dtype) if count > 0 else np.empty(0, dtype)
+    if objectCount > 0 and count % objectCount == 0:
+        return values.reshape(objectCount, count // objectCount)
+    return values
 
-def simxGetObjectGroupData(clientID, objectType, dataType, operationMode):
+def simxGetObjectGroupData(clientID, objectType, dataType, operationMode, asArray=False):
     '''
     Please have a look at the function description/documentation in the CoppeliaSim user manual
+
+    With asArray=True, handles are returned as an int32 ndarray and intData/floatData as int32/float32
+    ndarrays of shape (objectCount, valuesPerObject), e.g. (n, 3) for absolute positions.
     '''
 
     handles =[]
@@ -1386,28 +1471,20 @@ def simxGetObjectGroupData(clientID, objectType, dataType, operationMode):
     stringDataP = ct.POINTER(ct.c_char)()
     ret = c_GetObjectGroupData(clientID, objectType, dataType, ct.byref(handlesC), ct.byref(handlesP), ct.byref(intDataC), ct.byref(intDataP), ct.byref(floatDataC), ct.byref(floatDataP), ct.byref(stringDataC), ct.byref(stringDataP), operationMode)
 
-    if ret == 0:
-        for i in range(handlesC.value):
-            handles.append(handlesP[i])
-        for i in range(intDataC.value):
-            intData.append(intDataP[i])
-        for i in range(floatDataC.value):
-            floatData.append(floatDataP[i])
-        s = 0
-        for i in range(stringDataC.value):
-            a = bytearray()
-            while stringDataP[s] != b'\0':
-                if sys.version_info[0] == 3:
-                    a.append(int.from_bytes(stringDataP[s],'big'))
-                else:
-                    a.append(stringDataP[s])
-                s += 1
-            s += 1 #skip null
-            if sys.version_info[0] == 3:
-                a=str(a,'utf-8')
-            else:
-                a=str(a)
-            stringData.append(a)
+    if ret == 0 and asArray:
+        handles = _groupDataArray(handlesP, handlesC.value, np.int32, 0)
+        intData = _groupDataArray(intDataP, intDataC.value, np.int32, handlesC.value)
+        floatData = _groupDataArray(floatDataP, floatDataC.value, np.float32, handlesC.value)
+        stringData = _splitStringBlock(stringDataP, stringDataC.value)
+    elif ret == 0:
+        handles = handlesP[:handlesC.value]
+        intData = intDataP[:intDataC.value]
+        floatData = floatDataP[:floatDataC.value]
+        stringData = _splitStringBlock(stringDataP, stringDataC.value)
+    elif asArray:
+        handles = np.empty(0, np.int32)
+        intData = np.empty(0, np.int32)
+        floatData = np.empty(0, np.float32)
 
     return ret, handles, intData, floatData, stringData
 
@@ -1510,49 +1587,49 @@ def simxGetObjectVelocity(clientID, objectHandle, operationMode):
 def simxPackInts(intList):
     '''
     Please have a look at the function description/documentation in the CoppeliaSim user manual
+
+    Also accepts an ndarray, which is converted to little-endian int32 in one go.
     '''
 
+    if isinstance(intList, np.ndarray):
+        return bytearray(np.ascontiguousarray(intList, dtype='<i4'))
+    s=struct.pack('<%di' % len(intList), *intList)
     if sys.version_info[0] == 3:
-        s=bytes()
-        for i in range(len(intList)):
-            s=s+struct.pack('<i',intList[i])
         s=bytearray(s)
-    else:
-        s=''
-        for i in range(len(intList)):
-            s+=struct.pack('<i',intList[i])
     return s
 
-def simxUnpackInts(intsPackedInString):
+def simxUnpackInts(intsPackedInString, asArray=False):
     '''
     Please have a look at the function description/documentation in the CoppeliaSim user manual
+
+    With asArray=True an int32 ndarray sharing memory with the packed buffer is returned instead of a list.
     '''
-    b=[]
-    for i in range(int(len(intsPackedInString)/4)):
-        b.append(struct.unpack('<i',intsPackedInString[4*i:4*(i+1)])[0])
-    return b
+    count=len(intsPackedInString)//4
+    if asArray:
+        return np.frombuffer(intsPackedInString, dtype='<i4', count=count)
+    return list(struct.unpack_from('<%di' % count, intsPackedInString))
 
 def simxPackFloats(floatList):
     '''
     Please have a look at the function description/documentation in the CoppeliaSim user manual
+
+    Also accepts an ndarray, which is converted to little-endian float32 in one go.
     '''
 
+    if isinstance(floatList, np.ndarray):
+        return bytearray(np.ascontiguousarray(floatList, dtype='<f4'))
+    s=struct.pack('<%df' % len(floatList), *floatList)
     if sys.version_info[0] == 3:
-        s=bytes()
-        for i in range(len(floatList)):
-            s=s+struct.pack('<f',floatList[i])
         s=bytearray(s)
-    else:
-        s=''
-        for i in range(len(floatList)):
-            s+=struct.pack('<f',floatList[i])
     return s
 
-def simxUnpackFloats(floatsPackedInString):
+def simxUnpackFloats(floatsPackedInString, asArray=False):
     '''
     Please have a look at the function description/documentation in the CoppeliaSim user manual
+
+    With asArray=True a float32 ndarray sharing memory with the packed buffer is returned instead of a list.
     '''
-    b=[]
-    for i in range(int(len(floatsPackedInString)/4)):
-        b.append(struct.unpack('<f',floatsPackedInString[4*i:4*(i+1)])[0])
-    return b
+    count=len(floatsPackedInString)//4
+    if asArray:
+        return np.frombuffer(floatsPackedInString, dtype='<f4', count=count)
+    return list(struct.unpack_from('<%df' % count, floatsPackedInString))
@@ -0,0 +1,136 @@
+import atexit
+import os
+import threading
+import numpy as np
+
+
+class TelemetryWriter:
+    """
+    Appends rows of numbers to a CSV file without slowing down the control loop.
+
+    Rows go into a preallocated NumPy buffer with one row per column. A background thread writes the buffer
+    to the end of the file whenever flush_rows rows are collected or flush_interval seconds have passed,
+    while the loop keeps filling a second buffer. Memory is therefore bounded by two buffers; should the
+    disk fall behind by a full buffer, append waits for it instead of dropping rows.
+
+    Whatever is still buffered is written by close(), which also runs at interpreter exit, so a run
+    stopped with Ctrl-C keeps its last rows.
+
+    Attributes:
+        path (str): The file the rows are appended to.
+        columns (tuple): The column names, written as the header of a new file.
+        rows (int): The number of rows appended so far.
+    """
+
+    def __init__(self, path, columns, flush_rows=1024, flush_interval=1.0, append=False):
+        """
+        Args:
+            path (str): The file to write, e.g. 'error.csv'.
+            columns (list): The column names, in the order append receives the values.
+            flush_rows (int): The number of rows per buffer and per write.
+            flush_interval (float): The longest time in seconds a row waits in the buffer.
+            append (bool): Add to an existing file with the same columns instead of replacing it.
+        """
+        self.path = path
+        self.columns = tuple(columns)
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.rows = 0
+        self._buffer = np.empty((len(self.columns), flush_rows))
+        self._spare = np.empty_like(self._buffer)
+        self._count = 0
+        self._pending = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._open(append)
+        self._thread = threading.Thread(target=self._run, name=f"telemetry {path}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _open(self, append):
+        """Opens the file, writing the header unless rows are appended to an existing file."""
+        has_rows = append and os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        self._file = open(self.path, 'a' if append else 'w')
+        if not has_rows:
+            self._file.write(','.join(self.columns) + '\n')
+            self._file.flush()
+
+    def _write(self, columns):
+        """Writes a block of rows, given as an array with one row per column, to the file."""
+        # tolist gives Python floats, whose repr is the shortest text that reads back to the same value
+        self._file.write(''.join(','.join(map(repr, row)) + '\n' for row in columns.T.tolist()))
+        self._file.flush()
+
+    def append(self, *values):
+        """
+        Adds one row.
+
+        Args:
+            *values (float): One value per column.
+        """
+        with self._condition:
+            if self._closed:
+                raise ValueError(f"{self.path} is closed")
+            self._buffer[:, self._count] = values
+            self._count += 1
+            self.rows += 1
+            if self._count == self.flush_rows:
+                self._hand_over()
+
+    def _hand_over(self):
+        """Passes the filled part of the buffer to the background thread; called with the lock held."""
+        while self._pending is not None:
+            self._condition.wait()
+        self._pending = (self._buffer, self._count)
+        self._buffer, self._spare = self._spare, None
+        self._count = 0
+        self._condition.notify_all()
+
+    def _run(self):
+        self._condition.acquire()
+        try:
+            while True:
+                if self._pending is None and not self._closed:
+                    self._condition.wait(self.flush_interval)
+                if self._pending is None and self._count:
+                    self._hand_over()
+                if self._pending is None:
+                    if self._closed:
+                        return
+                    continue
+                buffer, count = self._pending
+                self._condition.release()
+                try:
+                    self._write(buffer[:, :count])
+                finally:
+                    self._condition.acquire()
+                    self._pending = None
+                    self._spare = buffer
+                    self._condition.notify_all()
+        finally:
+            self._condition.release()
+
+    def flush(self):
+        """Writes all rows appended so far and waits until they are in the file."""
+        with self._condition:
+            if self._count:
+                self._hand_over()
+            while self._pending is not None:
+                self._condition.wait()
+
+    def close(self):
+        """Writes the remaining rows and closes the file. Closing twice does nothing."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._file.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
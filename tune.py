@@ -0,0 +1,267 @@
+"""
+Searches PID gains for the line follower by running lineMaze.follow_line episodes in parallel.
+
+Every worker process owns one simulator: a kinematic stand-in by default, or a CoppeliaSim instance of a
+connection.ClientPool with --backend legacy. Each episode starts the robot from the same place, runs
+--steps control ticks and is scored on the integrated absolute error (IAE) and, on the kinematic track,
+the time of the first lap. The ranked results are written to a CSV leaderboard.
+
+    python tune.py random --samples 200 --workers 16
+    python tune.py grid --points 6
+    python tune.py descent --rounds 10
+    python tune.py random --backend legacy --ports 19997 19998 19999 --executable coppeliaSim.sh \\
+        --scene scenes/lineMazeNewLegacy.ttt
+"""
+import argparse
+import csv
+import itertools
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+GAINS = ('KP', 'KD', 'KI')
+# the gains of lineMaze.py, per second at the 50 ms simulation step
+START = {'KP': 0.015, 'KD': 0.0075 * 0.05, 'KI': 0.0001 / 0.05}
+BOUNDS = {'KP': (0.002, 0.1), 'KD': (0.00005, 0.005), 'KI': (0.0002, 0.02)}
+# wheel speeds giving about the same ground speed in both backends
+BASE_SPEEDS = {'kinematic': 5.0, 'legacy': 0.5}
+DT = 0.05
+# follow_line's error when the camera sees no line at all
+LOST_ERROR = 60
+
+_backend = None
+
+
+def init_worker(backend, port_queue=None, host='127.0.0.1'):
+    """
+    Process pool initializer: creates the simulator of this worker and silences follow_line's prints.
+    """
+    global _backend
+    sys.stdout = open(os.devnull, 'w')
+    _backend = backend
+    if backend == 'legacy':
+        import connection
+        connection.init_worker(port_queue, host)
+
+
+def _kinematic_episode(gains, steps, base_speed, lost_after):
+    import lineMaze
+    from devices import DriveBase, ColorSensor, line_follower_scene
+    from pid import PID
+
+    scene = line_follower_scene(dt=DT)
+    drive_base, color_sensor = DriveBase(scene), ColorSensor(scene)
+    # the controller settings of lineMaze.py, so the gains found carry over
+    pid = PID(*gains, dt=DT, initial_error=0)
+    errors = []
+    lap_time = None
+    start_heading = scene.heading
+
+    def tick(t):
+        nonlocal lap_time
+        errors.append(lineMaze.follow_line(color_sensor, drive_base, base_speed, pid))
+        # the track is a closed counterclockwise loop, so one lap is one full turn
+        if lap_time is None and scene.heading - start_heading >= 2 * math.pi:
+            lap_time = scene.time
+            return False
+        if len(errors) >= lost_after and min(errors[-lost_after:]) >= LOST_ERROR:
+            return False
+
+    scene.run(tick, steps)
+    return errors, lap_time
+
+
+def _legacy_episode(gains, steps, base_speed, lost_after):
+    import connection
+    import lineMaze
+    from devices import DriveBase, ColorSensor, LegacyTransport
+    from pid import PID
+
+    transport = LegacyTransport(connection.worker_client())
+    # the controller settings of lineMaze.py, so the gains found carry over
+    pid = PID(*gains, dt=DT, initial_error=0)
+    errors = []
+
+    def tick(t):
+        errors.append(lineMaze.follow_line(color_sensor, drive_base, base_speed, pid))
+        if len(errors) >= lost_after and min(errors[-lost_after:]) >= LOST_ERROR:
+            return False
+
+    # stopping the simulation at the end of the episode puts the robot back to its start
+    with connection.SynchronousRunner(transport.clientID) as runner:
+        # the scene publishes the "Sensors" signal from its first step, which only runs once triggered
+        runner.step()
+        drive_base, color_sensor = DriveBase(transport), ColorSensor(transport)
+        runner.run(tick, steps + 1)
+        transport.close()
+    # the scene does not report the pose, so there is no lap time
+    return errors, None
+
+
+def evaluate(gains, steps=2000, base_speed=None, lost_after=40, lap_weight=1.0):
+    """
+    Runs one episode with the given gains on the simulator of this worker.
+
+    Args:
+        gains (tuple): KP, KD and KI per second.
+        steps (int): The length of the episode in control ticks.
+        base_speed (float): The forward wheel speed; by default the one in BASE_SPEEDS.
+        lost_after (int): The episode ends once the line was not seen for this many ticks.
+        lap_weight (float): The weight of the lap time in the score.
+
+    Returns:
+        dict: The gains, 'iae', 'lap_time', 'ticks', 'lost' and 'score', lower is better. The score is the
+        mean absolute error plus lap_weight times the lap time; episodes without a lap count as a lap of
+        twice the episode length.
+    """
+    base_speed = BASE_SPEEDS[_backend] if base_speed is None else base_speed
+    episode = _kinematic_episode if _backend == 'kinematic' else _legacy_episode
+    errors, lap_time = episode(gains, steps, base_speed, lost_after)
+    errors = np.asarray(errors)
+    ticks = len(errors)
+    lost = ticks >= lost_after and bool(np.all(errors[-lost_after:] >= LOST_ERROR))
+    iae = float(np.abs(errors).sum() * DT)
+    duration = ticks * DT
+    if lost:
+        # the remaining ticks are charged at the error of a lost robot
+        iae += (steps - ticks) * LOST_ERROR * DT
+        duration = steps * DT
+    lap_penalty = lap_time if lap_time is not None else 2 * steps * DT
+    # the mean error, so episodes ending early with a lap are not favoured for their shorter integral
+    score = iae / max(duration, DT) + lap_weight * lap_penalty
+    return {**dict(zip(GAINS, gains)), 'score': score,
+            'iae': iae, 'lap_time': lap_time, 'ticks': ticks, 'lost': lost}
+
+
+def _log_space(low, high, points):
+    return np.geomspace(low, high, points).tolist()
+
+
+def grid(bounds, points):
+    """
+    Returns:
+        list: Every combination of points log-spaced values per gain.
+    """
+    return list(itertools.product(*(_log_space(*bounds[gain], points) for gain in GAINS)))
+
+
+def random_gains(bounds, samples, seed=0):
+    """
+    Returns:
+        list: samples gain sets drawn log-uniformly within bounds.
+    """
+    rng = np.random.default_rng(seed)
+    low = np.log([bounds[gain][0] for gain in GAINS])
+    high = np.log([bounds[gain][1] for gain in GAINS])
+    return [tuple(np.exp(rng.uniform(low, high)).tolist()) for _ in range(samples)]
+
+
+def coordinate_descent(run, start, rounds, factor=2.0, log=print):
+    """
+    Improves the gains by scaling one gain at a time up or down by factor. Each round evaluates all six
+    neighbours at once; after a round without improvement the factor shrinks to its square root.
+
+    Args:
+        run (callable): Maps a list of gain sets to their results, in order.
+        start (tuple): The gains to start from.
+        rounds (int): The number of rounds.
+        factor (float): The initial scale step.
+
+    Returns:
+        list: The results of all episodes.
+    """
+    best = run([start])[0]
+    results = [best]
+    for i in range(rounds):
+        gains = [best[gain] for gain in GAINS]
+        candidates = []
+        for index, scale in itertools.product(range(len(GAINS)), (factor, 1 / factor)):
+            candidate = list(gains)
+            candidate[index] *= scale
+            candidates.append(tuple(candidate))
+        round_results = run(candidates)
+        results.extend(round_results)
+        challenger = min(round_results, key=lambda result: result['score'])
+        if challenger['score'] < best['score']:
+            best = challenger
+        else:
+            factor = math.sqrt(factor)
+        log(f"round {i + 1}: best score {best['score']:.4g} with " +
+            ', '.join(f"{gain}={best[gain]:.4g}" for gain in GAINS))
+    return results
+
+
+def write_leaderboard(results, path):
+    """Writes the results sorted by score, best first, to a CSV file."""
+    ranked = sorted(results, key=lambda result: result['score'])
+    columns = ['rank', *GAINS, 'score', 'iae', 'lap_time', 'ticks', 'lost']
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, columns)
+        writer.writeheader()
+        for rank, result in enumerate(ranked, 1):
+            writer.writerow({'rank': rank, **result})
+    return ranked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('strategy', choices=['grid', 'random', 'descent'])
+    parser.add_argument('--backend', choices=['kinematic', 'legacy'], default='kinematic')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--steps', type=int, default=2000, help='control ticks per episode')
+    parser.add_argument('--base-speed', type=float, help='forward wheel speed, by default per backend')
+    parser.add_argument('--lap-weight', type=float, default=1.0, help='weight of the lap time in the score')
+    parser.add_argument('--points', type=int, default=5, help='grid: values per gain')
+    parser.add_argument('--samples', type=int, default=100, help='random: number of gain sets')
+    parser.add_argument('--seed', type=int, default=0, help='random: seed')
+    parser.add_argument('--rounds', type=int, default=10, help='descent: number of rounds')
+    parser.add_argument('--ports', type=int, nargs='+', help='legacy: ports of the simulators, one per worker')
+    parser.add_argument('--host', default='127.0.0.1', help='legacy: address of the simulators')
+    parser.add_argument('--executable', help='legacy: CoppeliaSim executable to launch one instance per port')
+    parser.add_argument('--scene', help='legacy: scene loaded by launched instances')
+    parser.add_argument('--out', default='leaderboard.csv', help='the leaderboard CSV file')
+    args = parser.parse_args()
+
+    pool = None
+    initargs = (args.backend,)
+    workers = args.workers
+    if args.backend == 'legacy':
+        from connection import ClientPool
+        if not args.ports:
+            parser.error('--backend legacy needs --ports')
+        pool = ClientPool(args.ports, args.host, args.executable, args.scene)
+        pool.start()
+        initargs = (args.backend, pool.port_queue(), args.host)
+        workers = len(pool)
+
+    started = time.monotonic()
+    try:
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=initargs) as executor:
+            def run(gain_sets):
+                return list(executor.map(evaluate, gain_sets, itertools.repeat(args.steps),
+                                         itertools.repeat(args.base_speed), itertools.repeat(40),
+                                         itertools.repeat(args.lap_weight)))
+
+            if args.strategy == 'grid':
+                results = run(grid(BOUNDS, args.points))
+            elif args.strategy == 'random':
+                results = run(random_gains(BOUNDS, args.samples, args.seed))
+            else:
+                results = coordinate_descent(run, tuple(START[gain] for gain in GAINS), args.rounds)
+    finally:
+        if pool is not None:
+            pool.close()
+
+    ranked = write_leaderboard(results, args.out)
+    print(f"{len(results)} episodes in {time.monotonic() - started:.1f} s, leaderboard written to {args.out}")
+    for rank, result in enumerate(ranked[:10], 1):
+        lap = 'no lap' if result['lap_time'] is None else f"lap {result['lap_time']:.1f} s"
+        print(f"{rank:3d}. score {result['score']:.4g}  IAE {result['iae']:.4g}  {lap}  " +
+              ', '.join(f"{gain}={result[gain]:.4g}" for gain in GAINS))
+
+
+if __name__ == "__main__":
+    main()